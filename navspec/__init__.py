@@ -4,9 +4,16 @@ __version__ = "0.1.0"
 __author__ = "Boni Dukic"
 __email__ = "boni@dukic.dev"
 
-from .config import ConfigManager
-from .server import DashboardServer
-from .types import Category, DashboardConfig, DashboardMetadata, Link
+# Public classes are imported lazily so lightweight entry points such as
+# `navspec query` do not pay for importing Flask, PyYAML and watchdog
+_LAZY_IMPORTS = {
+    "ConfigManager": ".config",
+    "DashboardServer": ".server",
+    "DashboardConfig": ".types",
+    "Category": ".types",
+    "Link": ".types",
+    "DashboardMetadata": ".types",
+}
 
 __all__ = [
     "ConfigManager",
@@ -16,3 +23,12 @@ __all__ = [
     "Link",
     "DashboardMetadata",
 ]
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,198 @@
+"""Aggregated "all dashboards" view for navspec.
+
+Links from every configuration are merged into a single dashboard and
+deduplicated by normalized URL, with their tags merged. The view keeps each
+config's contribution separately, so when one file changes only the links
+it touches are re-merged and re-sorted.
+"""
+
+import bisect
+import hashlib
+import threading
+import urllib.parse
+from typing import Any, Dict, List, Optional, Tuple
+
+from .types import DashboardConfig
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL for deduplication.
+
+    Lowercases the scheme and host, drops default ports, fragments and
+    trailing slashes. Anything unparseable is compared verbatim.
+    """
+    try:
+        parts = urllib.parse.urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url.strip()
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if port and port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    path = parts.path.rstrip("/")
+    return urllib.parse.urlunsplit((scheme, host, path, parts.query, ""))
+
+
+class _MergedLink:
+    """One deduplicated link and the configs contributing to it."""
+
+    def __init__(self, key: str):
+        self.key = key
+        # config name -> (category name, link dict), in config order
+        self.contributions: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        self.merged: Optional[Dict[str, Any]] = None
+        self.sort_key: Optional[Tuple] = None
+
+    def merge(self, config_order: Dict[str, int]) -> Tuple:
+        """Recompute the merged link and return its new sort key."""
+        configs = sorted(self.contributions, key=lambda name: config_order[name])
+        category, first = self.contributions[configs[0]]
+
+        tags = []
+        categories = []
+        for config_name in configs:
+            link_category, link = self.contributions[config_name]
+            for tag in link.get("tags") or []:
+                if tag not in tags:
+                    tags.append(tag)
+            if link_category not in categories:
+                categories.append(link_category)
+
+        self.merged = dict(first, tags=tags, configs=configs, categories=categories)
+        self.sort_key = (category.lower(), first["name"].lower(), self.key)
+        return self.sort_key
+
+
+class AggregateView:
+    """Incrementally maintained merge of every configuration."""
+
+    def __init__(self):
+        self.configs: Dict[str, str] = {}  # config name -> version
+        self._keys: Dict[str, List[str]] = {}  # config name -> link keys
+        self._links: Dict[str, _MergedLink] = {}
+        self._order: List[Tuple] = []  # sorted sort keys
+        self._config_order: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> str:
+        """Combined version of every merged configuration."""
+        with self._lock:
+            state = ",".join(f"{n}={v}" for n, v in sorted(self.configs.items()))
+        return hashlib.sha256(state.encode("utf-8")).hexdigest()[:16]
+
+    def update(self, config_name: str, version: str, config: DashboardConfig) -> int:
+        """Merge a config's links, replacing its previous contribution.
+
+        Returns the number of merged links that had to be recomputed.
+        """
+        with self._lock:
+            if self.configs.get(config_name) == version:
+                return 0
+
+            if config_name not in self._config_order:
+                self._config_order[config_name] = len(self._config_order)
+                self._reorder_configs()
+
+            contributions: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+            for category in config.categories:
+                for link in category.links:
+                    key = normalize_url(link.url)
+                    # The first occurrence within a config wins
+                    contributions.setdefault(key, (category.name, link.to_dict()))
+
+            affected = set(self._keys.get(config_name, [])) | set(contributions)
+            for key in affected:
+                merged = self._links.get(key)
+                if merged is None:
+                    merged = self._links[key] = _MergedLink(key)
+
+                if key in contributions:
+                    if merged.contributions.get(config_name) == contributions[key]:
+                        continue
+                    merged.contributions[config_name] = contributions[key]
+                else:
+                    merged.contributions.pop(config_name, None)
+                self._remerge(merged)
+
+            self._keys[config_name] = list(contributions)
+            self.configs[config_name] = version
+            return len(affected)
+
+    def remove(self, config_name: str):
+        """Drop a config's links from the view."""
+        with self._lock:
+            if config_name not in self.configs:
+                return
+            for key in self._keys.pop(config_name, []):
+                merged = self._links[key]
+                merged.contributions.pop(config_name, None)
+                self._remerge(merged)
+            del self.configs[config_name]
+
+    def _reorder_configs(self):
+        # Keep config precedence alphabetical, matching the config selector
+        for position, name in enumerate(sorted(self._config_order)):
+            self._config_order[name] = position
+
+    def _remerge(self, merged: _MergedLink):
+        if merged.sort_key is not None:
+            index = bisect.bisect_left(self._order, merged.sort_key)
+            del self._order[index]
+
+        if not merged.contributions:
+            del self._links[merged.key]
+            return
+
+        bisect.insort(self._order, merged.merge(self._config_order))
+
+    def links(self) -> List[Dict[str, Any]]:
+        """Every merged link, in display order."""
+        with self._lock:
+            return self._merged_links(self._order)
+
+    def _merged_links(self, sort_keys: List[Tuple]) -> List[Dict[str, Any]]:
+        links = (self._links[sort_key[2]].merged for sort_key in sort_keys)
+        # Every ordered link has been merged; the filter only narrows the type
+        return [link for link in links if link is not None]
+
+    def page(self, offset: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """Return one page of the merged dashboard, grouped by category."""
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        offset = max(0, offset)
+
+        with self._lock:
+            total = len(self._order)
+            sort_keys = self._order[offset : offset + limit]
+            links = self._merged_links(sort_keys)
+            configs = sorted(self.configs)
+
+        categories: List[Dict[str, Any]] = []
+        for link in links:
+            category = link["categories"][0]
+            if not categories or categories[-1]["name"] != category:
+                categories.append(
+                    {"name": category, "description": "", "icon": None, "links": []}
+                )
+            categories[-1]["links"].append(link)
+
+        return {
+            "metadata": {
+                "name": "All dashboards",
+                "description": f"Links from {len(configs)} configurations",
+                "version": self.version,
+                "tags": [],
+            },
+            "categories": categories,
+            "configs": configs,
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+        }
@@ -2,13 +2,11 @@
 
 import argparse
 import sys
-import threading
 import time
-import webbrowser
 from pathlib import Path
 
-from .config import ConfigManager
-from .server import create_server
+# Commands import the rest of navspec lazily: `navspec query` and
+# `navspec open` must not pay for Flask, PyYAML or watchdog
 
 # Global flag to track if browser has been opened
 _browser_opened = False
@@ -25,7 +23,13 @@ Examples:
   navspec serve --port 7777       # Serve on port 7777
   navspec serve --config ./config # Serve from ./config directory
   navspec serve --no-browser      # Serve without opening browser
+  navspec serve --source https://example.com/team.yaml  # Add a remote config
+  navspec serve --tenants ./teams # Serve every team under /<team>/
   navspec init                    # Initialize new dashboard configuration
+  navspec loadtest --duration 30  # Load test an in-process server
+  navspec loadtest --url http://127.0.0.1:7777 --baseline base.json
+  navspec query grafana prod      # Search links from the terminal
+  navspec open grafana prod       # Open the best match in the browser
         """,
     )
 
@@ -51,6 +55,50 @@ Examples:
     serve_parser.add_argument(
         "--no-browser", action="store_true", help="Don't automatically open browser"
     )
+    serve_parser.add_argument(
+        "--source",
+        action="append",
+        default=[],
+        help="Remote config source: YAML URL, tarball or git+<url>[#ref] (repeatable)",
+    )
+    serve_parser.add_argument(
+        "--refresh-interval",
+        type=float,
+        default=None,
+        help="Seconds between remote source refreshes (default: 300)",
+    )
+    serve_parser.add_argument(
+        "--favicons",
+        action="store_true",
+        help="Fetch favicons for link hosts and show them on the dashboard",
+    )
+    serve_parser.add_argument(
+        "--favicon-url",
+        help="Favicon URL template with {origin} or {host} "
+        "(default: {origin}/favicon.ico)",
+    )
+    serve_parser.add_argument(
+        "--tenants",
+        help="Serve each subdirectory of this directory as a separate tenant",
+    )
+    serve_parser.add_argument(
+        "--tenant-routing",
+        choices=["path", "host"],
+        default="path",
+        help="Select tenants by path (/<tenant>/) or host (<tenant>.example.com) prefix",
+    )
+    serve_parser.add_argument(
+        "--memory-budget",
+        type=int,
+        default=None,
+        help="Megabytes of loaded tenant configs to keep in memory (default: 256)",
+    )
+    serve_parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=None,
+        help="Seconds before an idle tenant's file watcher is stopped (default: 300)",
+    )
 
     # Init command
     init_parser = subparsers.add_parser(
@@ -73,6 +121,81 @@ Examples:
         help="Dashboard description",
     )
 
+    # Loadtest command
+    loadtest_parser = subparsers.add_parser(
+        "loadtest", help="Measure latency and throughput of a dashboard server"
+    )
+    loadtest_parser.add_argument(
+        "--url",
+        help="Server to test, e.g. http://127.0.0.1:7777 (default: start one in-process)",
+    )
+    loadtest_parser.add_argument(
+        "--config",
+        "-c",
+        default=".",
+        help="Configuration directory for the in-process server (default: current directory)",
+    )
+    loadtest_parser.add_argument(
+        "--concurrency",
+        "-n",
+        type=int,
+        default=50,
+        help="Number of concurrent keep-alive clients (default: 50)",
+    )
+    loadtest_parser.add_argument(
+        "--duration",
+        "-d",
+        type=float,
+        default=10.0,
+        help="Test duration in seconds (default: 10)",
+    )
+    loadtest_parser.add_argument(
+        "--requests", type=int, help="Stop after this many requests"
+    )
+    loadtest_parser.add_argument(
+        "--mix",
+        help="Weighted request mix, e.g. '/api/config=4,/=1' (default: read-only endpoints)",
+    )
+    loadtest_parser.add_argument(
+        "--writes",
+        action="store_true",
+        help="Allow requests that modify the server, such as saving preferences",
+    )
+    loadtest_parser.add_argument("--save", help="Save the report as JSON")
+    loadtest_parser.add_argument("--baseline", help="Compare against a saved report")
+    loadtest_parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.1,
+        help="Fail if p50/p99/throughput regress by more than this ratio (default: 0.1)",
+    )
+
+    # Query and open commands
+    query_parser = subparsers.add_parser("query", help="Search links")
+    open_parser = subparsers.add_parser(
+        "open", help="Open the best matching link in the browser"
+    )
+    for search_parser in (query_parser, open_parser):
+        search_parser.add_argument("terms", nargs="+", help="Search terms")
+        search_parser.add_argument(
+            "--config",
+            "-c",
+            default=".",
+            help="Project directory (default: current directory)",
+        )
+        search_parser.add_argument(
+            "--rebuild", action="store_true", help="Rebuild the search index first"
+        )
+    query_parser.add_argument(
+        "--limit", "-n", type=int, default=10, help="Maximum results (default: 10)"
+    )
+    open_parser.add_argument(
+        "--print",
+        dest="print_only",
+        action="store_true",
+        help="Print the URL instead of opening it",
+    )
+
     # Parse arguments
     args = parser.parse_args()
 
@@ -82,9 +205,19 @@ Examples:
 
     # Execute command
     if args.command == "serve":
+        if args.tenants and (args.source or args.favicons):
+            serve_parser.error("--source and --favicons cannot be used with --tenants")
+        if args.favicon_url and not args.favicons:
+            serve_parser.error("--favicon-url requires --favicons")
         serve_dashboard(args)
     elif args.command == "init":
         init_dashboard(args)
+    elif args.command == "loadtest":
+        loadtest_dashboard(args)
+    elif args.command == "query":
+        query_links(args)
+    elif args.command == "open":
+        open_link(args)
     else:
         print(f"Unknown command: {args.command}")
         sys.exit(1)
@@ -92,6 +225,8 @@ Examples:
 
 def open_browser(host: str, port: int, delay: float = 1.0):
     """Open the browser after a short delay to ensure server is running."""
+    import webbrowser
+
     time.sleep(delay)
     url = f"http://{host}:{port}"
     try:
@@ -104,6 +239,19 @@ def open_browser(host: str, port: int, delay: float = 1.0):
 
 def serve_dashboard(args):
     """Serve the dashboard."""
+    import threading
+
+    from werkzeug.serving import is_running_from_reloader
+
+    from .icons import DEFAULT_URL_TEMPLATE
+    from .search import resolve_paths
+    from .server import create_server, is_serving_process, run_reloader_parent
+    from .sources import DEFAULT_REFRESH_INTERVAL
+
+    if args.tenants:
+        serve_tenants(args)
+        return
+
     config_path = Path(args.config).resolve()
 
     if not config_path.exists():
@@ -113,9 +261,9 @@ def serve_dashboard(args):
     print("Starting navspec dashboard...")
     print(f"Configuration path: {config_path}")
 
-    # Show where configs are actually loaded from
-    config_manager = ConfigManager(str(config_path))
-    actual_config_path = config_manager.config_path
+    # Show where configs are actually loaded from, without starting a
+    # ConfigManager that would compete with the server's journals
+    actual_config_path, _ = resolve_paths(str(config_path))
     if actual_config_path != config_path:
         print(f"Loading configs from: {actual_config_path}")
         print("Tip: This project uses a 'config/' folder for organization")
@@ -127,9 +275,10 @@ def serve_dashboard(args):
     print("Press Ctrl+C to stop")
     print()
 
-    # Only open browser once per session (unless disabled)
+    # Only open browser once per session (unless disabled); a restarted
+    # reloader child must not open another one
     global _browser_opened
-    if not _browser_opened and not args.no_browser:
+    if not _browser_opened and not args.no_browser and not is_running_from_reloader():
         # Start browser opening in background thread
         browser_thread = threading.Thread(
             target=open_browser, args=(args.host, args.port), daemon=True
@@ -137,11 +286,75 @@ def serve_dashboard(args):
         browser_thread.start()
         _browser_opened = True
 
+    reload = not args.no_reload
+    if not is_serving_process(reload):
+        run_reloader_parent(args.host, args.port)
+        return
+
     try:
         server = create_server(
-            config_path=str(config_path), port=args.port, host=args.host
+            config_path=str(config_path),
+            port=args.port,
+            host=args.host,
+            sources=args.source,
+            refresh_interval=args.refresh_interval or DEFAULT_REFRESH_INTERVAL,
+            favicons=args.favicons,
+            favicon_url=args.favicon_url or DEFAULT_URL_TEMPLATE,
         )
-        server.run(reload=not args.no_reload)
+        server.run(reload=reload)
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+        server.stop()
+    except Exception as e:
+        print(f"Error starting server: {e}")
+        sys.exit(1)
+
+
+def serve_tenants(args):
+    """Serve many config roots from one multi-tenant server."""
+    from .server import create_server, is_serving_process, run_reloader_parent
+    from .tenants import DEFAULT_IDLE_TIMEOUT, DEFAULT_MEMORY_BUDGET
+
+    tenants_dir = Path(args.tenants).resolve()
+    if not tenants_dir.is_dir():
+        print(f"Error: Tenants directory does not exist: {tenants_dir}")
+        sys.exit(1)
+
+    if args.tenant_routing == "path":
+        example = f"http://{args.host}:{args.port}/<tenant>/"
+    else:
+        example = f"http://<tenant>.<domain>:{args.port}/"
+
+    print("Starting navspec multi-tenant dashboard...")
+    print(f"Tenants directory: {tenants_dir}")
+    print(f"Tenants are served at {example}")
+    print(f"Tenant statistics: http://{args.host}:{args.port}/_tenants")
+    print("Press Ctrl+C to stop")
+    print()
+
+    reload = not args.no_reload
+    if not is_serving_process(reload):
+        run_reloader_parent(args.host, args.port)
+        return
+
+    try:
+        server = create_server(
+            port=args.port,
+            host=args.host,
+            tenants_dir=str(tenants_dir),
+            tenant_routing=args.tenant_routing,
+            memory_budget=(
+                args.memory_budget * 1024 * 1024
+                if args.memory_budget is not None
+                else DEFAULT_MEMORY_BUDGET
+            ),
+            idle_timeout=(
+                args.idle_timeout
+                if args.idle_timeout is not None
+                else DEFAULT_IDLE_TIMEOUT
+            ),
+        )
+        server.run(reload=reload)
     except KeyboardInterrupt:
         print("\nShutting down...")
         server.stop()
@@ -152,6 +365,8 @@ def serve_dashboard(args):
 
 def init_dashboard(args):
     """Initialize a new dashboard configuration."""
+    from .config import ConfigManager
+
     config_path = Path(args.config).resolve()
 
     # Create config subdirectory for organized structure
@@ -193,5 +408,91 @@ def init_dashboard(args):
         sys.exit(1)
 
 
+def loadtest_dashboard(args):
+    """Load test a running or in-process dashboard server."""
+    from .loadtest import (
+        InProcessServer,
+        LoadTestError,
+        compare_reports,
+        format_report,
+        load_report,
+        parse_mix,
+        run_load_test,
+        save_report,
+    )
+
+    try:
+        mix = parse_mix(args.mix, args.writes)
+        baseline = load_report(args.baseline) if args.baseline else None
+
+        if args.url:
+            report = run_load_test(
+                args.url, mix, args.concurrency, args.duration, args.requests
+            )
+        else:
+            config_path = Path(args.config).resolve()
+            if not config_path.exists():
+                print(f"Error: Configuration path does not exist: {config_path}")
+                sys.exit(1)
+
+            with InProcessServer(str(config_path)) as server:
+                print(f"Started in-process server: {server.url}")
+                report = run_load_test(
+                    server.url, mix, args.concurrency, args.duration, args.requests
+                )
+    except LoadTestError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(format_report(report, baseline))
+
+    if args.save:
+        save_report(report, args.save)
+        print(f"\nReport saved to: {args.save}")
+
+    if baseline is not None:
+        regressions = compare_reports(report, baseline, args.max_regression)
+        if regressions:
+            print("\nRegressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+
+
+def query_links(args):
+    """Print links matching the search terms."""
+    from .search import CATEGORY, CONFIG, NAME, URL, load_index
+
+    index = load_index(args.config, rebuild=args.rebuild)
+    results = index.search(" ".join(args.terms), limit=args.limit)
+    if not results:
+        print("No matching links")
+        sys.exit(1)
+
+    for _, entry in results:
+        print(f"{entry[NAME]}  [{entry[CONFIG]}: {entry[CATEGORY]}]  {entry[URL]}")
+
+
+def open_link(args):
+    """Open the best matching link in the browser."""
+    from .search import NAME, URL, load_index
+
+    index = load_index(args.config, rebuild=args.rebuild)
+    results = index.search(" ".join(args.terms), limit=1)
+    if not results:
+        print("No matching links")
+        sys.exit(1)
+
+    entry = results[0][1]
+    if args.print_only:
+        print(entry[URL])
+        return
+
+    import webbrowser
+
+    print(f"Opening {entry[NAME]}: {entry[URL]}")
+    webbrowser.open(entry[URL])
+
+
 if __name__ == "__main__":
     main()
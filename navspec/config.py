@@ -2,13 +2,28 @@
 
 import json
 import os
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import yaml
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
+from .aggregate import AggregateView
+from .facets import FacetIndex
+from .history import ConfigHistory, diff_configs
+from .journal import ConfigJournal, file_stat
+from .palette import PaletteIndex, build_palette_index
+from .reloader import RELOAD_DEBOUNCE, ConfigReloader, ConfigSnapshot
+from .search import resolve_paths
+from .sources import (
+    DEFAULT_REFRESH_INTERVAL,
+    ConfigSource,
+    SourceScheduler,
+    atomic_write,
+    create_source,
+)
 from .types import (
     Category,
     DashboardConfig,
@@ -22,16 +37,15 @@ from .types import (
 class ConfigManager:
     """Manages dashboard configuration files and user preferences."""
 
-    def __init__(self, config_path: str = "."):
-        self.config_path = Path(config_path).resolve()
-
-        # Look for configs in config/ subdirectory by default
-        # This is for development and organized projects
-        if (self.config_path / "config").exists():
-            self.config_path = self.config_path / "config"
-
-        # User config directory is always in the project root (not in config/ subfolder)
-        self.user_config_dir = Path(config_path).resolve() / ".navspec"
+    def __init__(
+        self,
+        config_path: str = ".",
+        sources: Optional[List[str]] = None,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+    ):
+        # Configs live in a config/ subdirectory when there is one, while the
+        # user config directory is always in the project root
+        self.config_path, self.user_config_dir = resolve_paths(config_path)
         self.user_config_file = self.user_config_dir / "preferences.json"
 
         # Ensure user config directory exists
@@ -40,9 +54,46 @@ class ConfigManager:
         # Load or create user preferences
         self.user_preferences = self._load_user_preferences()
 
+        # Recent versions of each loaded config, keyed by config name
+        self.history: Dict[str, ConfigHistory] = {}
+        self._history_lock = threading.Lock()
+
+        # Merged view of every config, updated as individual configs load
+        self.aggregate = AggregateView()
+
+        # Command palette indexes, rebuilt when a config's version changes
+        self.palette_indexes: Dict[str, PaletteIndex] = {}
+
+        # Remote sources are mirrored into .navspec/remote and refreshed
+        # in the background, so loading never waits on the network
+        self.remote_config_path = self.user_config_dir / "remote"
+        self.sources: List[ConfigSource] = []
+        for spec in sources or []:
+            source = create_source(spec)
+            source.attach(self.user_config_dir / "sources", self.remote_config_path)
+            self.sources.append(source)
+
+        # Journals for configs edited through the API, keyed by config name
+        self.journal_dir = self.user_config_dir / "journal"
+        self.journals: Dict[str, ConfigJournal] = {}
+        self._journals_lock = threading.Lock()
+        self._recover_journals()
+
+        # Configs are parsed off the request path and published as snapshots
+        self.reloader = ConfigReloader(self._build_snapshot)
+        self.reloader.start()
+        self.reloader.reload()
+
+        self.scheduler = None
+        if self.sources:
+            self.scheduler = SourceScheduler(
+                self.sources, refresh_interval, on_change=self._on_source_change
+            )
+            self.scheduler.start()
+
         # File watching
         self.observer = None
-        self._start_file_watching()
+        self.start_file_watching()
 
     def _load_user_preferences(self) -> UserPreferences:
         """Load user preferences from local file."""
@@ -62,13 +113,28 @@ class ConfigManager:
         with open(self.user_config_file, "w") as f:
             json.dump(self.user_preferences.to_dict(), f, indent=2)
 
-    def get_available_configs(self) -> List[str]:
-        """Get list of available YAML configuration files."""
+    def _list_configs(self) -> List[str]:
+        """List local and remotely mirrored config files."""
         configs = []
         for file_path in self.config_path.glob("*.yaml"):
             if file_path.name != ".navspec":  # Skip hidden directories
                 configs.append(file_path.name)
 
+        if self.sources and self.remote_config_path.exists():
+            # Local files take precedence over remote ones with the same name
+            for file_path in self.remote_config_path.glob("*.yaml"):
+                if file_path.name not in configs:
+                    configs.append(file_path.name)
+        return configs
+
+    def get_available_configs(self) -> List[str]:
+        """Get list of available YAML configuration files."""
+        configs = self._list_configs()
+        # A remote source may still provide default.yaml; a local one
+        # created now would shadow it
+        if self.sources and (configs or self.scheduler and self.scheduler.pending):
+            return sorted(configs)
+
         # Ensure default.yaml exists, create if not
         if not configs or "default.yaml" not in configs:
             self._create_default_config()
@@ -76,6 +142,19 @@ class ConfigManager:
 
         return sorted(configs)
 
+    def _resolve_config_file(self, config_name: str) -> Optional[Path]:
+        """Find a config file locally or in the remote mirror."""
+        config_file = self.config_path / config_name
+        if config_file.exists():
+            return config_file
+
+        if self.sources:
+            config_file = self.remote_config_path / config_name
+            if config_file.exists():
+                return config_file
+
+        return None
+
     def _create_default_config(self):
         """Create a default configuration file if none exists."""
         default_config = DashboardConfig(
@@ -105,31 +184,311 @@ class ConfigManager:
         with open(self.config_path / "default.yaml", "w") as f:
             yaml.dump(default_config.to_dict(), f, default_flow_style=False, indent=2)
 
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """The most recently published snapshot of every configuration."""
+        return self.reloader.snapshot
+
+    def _snapshot_for(self, config_name: str) -> ConfigSnapshot:
+        """Get a snapshot that includes a configuration, if it exists.
+
+        This never parses YAML. A file the reloader has not seen yet, for
+        example one created while nothing was watching, is picked up by
+        waiting for a reload that every concurrent caller shares.
+        """
+        snapshot = self.snapshot
+        if (
+            config_name not in snapshot.configs
+            and config_name not in snapshot.errors
+            and self._resolve_config_file(config_name) is not None
+        ):
+            snapshot = self.reloader.reload([config_name])
+        return snapshot
+
+    def load_config_with_version(
+        self, config_name: str = None
+    ) -> Tuple[Optional[DashboardConfig], Optional[str]]:
+        """Get a configuration and its version from one snapshot."""
+        if config_name is None:
+            config_name = self.user_preferences.active_config
+
+        snapshot = self._snapshot_for(config_name)
+        return (
+            snapshot.configs.get(config_name),
+            snapshot.versions.get(config_name),
+        )
+
     def load_config(self, config_name: str = None) -> Optional[DashboardConfig]:
-        """Load a specific configuration file."""
+        """Get a configuration from the current snapshot."""
+        return self.load_config_with_version(config_name)[0]
+
+    def reload(self, config_names: Optional[List[str]] = None, wait: bool = True):
+        """Re-read some configurations, or all of them, in the background."""
+        if wait:
+            self.reloader.reload(config_names)
+        else:
+            self.reloader.request(config_names, delay=RELOAD_DEBOUNCE)
+
+    def _read_config(
+        self, config_name: str
+    ) -> Tuple[Optional[DashboardConfig], Optional[tuple]]:
+        """Parse a configuration from its journal or YAML file.
+
+        Also returns the signature of the YAML file the config was parsed
+        from, or None if it came from a journal or the file changed while
+        it was read.
+        """
+        journal = self.journals.get(config_name)
+        if journal is not None:
+            return journal.snapshot(), None
+
+        config_file = self._resolve_config_file(config_name)
+        if config_file is None:
+            return None, None
+
+        stat = file_stat(config_file)
+        with open(config_file, "r") as f:
+            data = yaml.safe_load(f)
+        if file_stat(config_file) != stat:
+            stat = None
+        return DashboardConfig.from_dict(data), stat
+
+    def _build_snapshot(
+        self, previous: ConfigSnapshot, config_names: Optional[set]
+    ) -> ConfigSnapshot:
+        """Build the next snapshot, re-reading only the given configs.
+
+        Runs on the reloader thread. Configs that fail to parse, such as
+        half-written files, keep their previous version.
+        """
+        configs = {}
+        versions = {}
+        errors = {}
+        facets = {}
+        stats = {}
+        for config_name in sorted(self._list_configs()):
+            unchanged = config_names is not None and config_name not in config_names
+            if unchanged and config_name in previous.configs:
+                configs[config_name] = previous.configs[config_name]
+                versions[config_name] = previous.versions[config_name]
+                facets[config_name] = previous.facets[config_name]
+                if config_name in previous.stats:
+                    stats[config_name] = previous.stats[config_name]
+                if config_name in previous.errors:
+                    errors[config_name] = previous.errors[config_name]
+                continue
+            if unchanged and config_name in previous.errors:
+                errors[config_name] = previous.errors[config_name]
+                continue
+
+            try:
+                config, stat = self._read_config(config_name)
+            except (OSError, yaml.YAMLError, KeyError, TypeError, AttributeError) as e:
+                print(f"Error loading config {config_name}: {e}")
+                errors[config_name] = str(e)
+                config = None
+                if config_name in previous.configs:
+                    configs[config_name] = previous.configs[config_name]
+                    versions[config_name] = previous.versions[config_name]
+                    facets[config_name] = previous.facets[config_name]
+
+            if config is not None:
+                version = self._record_version(config_name, config)
+                configs[config_name] = config
+                versions[config_name] = version
+                facets[config_name] = self._facets_for(
+                    previous, config_name, config, version
+                )
+                if stat is not None:
+                    stats[config_name] = stat
+
+        self._prune(configs)
+        return ConfigSnapshot(
+            configs, versions, errors, previous.generation + 1, facets, stats
+        )
+
+    def _record_version(self, config_name: str, config: DashboardConfig) -> str:
+        """Record a loaded configuration in its version history."""
+        with self._history_lock:
+            history = self.history.setdefault(config_name, ConfigHistory())
+            return history.record(config.to_dict())
+
+    @staticmethod
+    def _facets_for(
+        previous: ConfigSnapshot,
+        config_name: str,
+        config: DashboardConfig,
+        version: str,
+    ) -> FacetIndex:
+        """Get the facet index for a config version, never mutating a published one."""
+        facets = previous.facets.get(config_name)
+        if facets is None:
+            return FacetIndex(config)
+        if previous.versions.get(config_name) == version:
+            return facets
+
+        # Update a copy so only the links that changed are touched
+        facets = facets.copy()
+        facets.update(config)
+        return facets
+
+    def _prune(self, configs: Dict[str, DashboardConfig]):
+        """Drop derived state kept for configs that no longer exist."""
+        with self._history_lock:
+            for config_name in set(self.history) - set(configs):
+                del self.history[config_name]
+        for config_name in set(self.palette_indexes) - set(configs):
+            self.palette_indexes.pop(config_name, None)
+
+    def get_facets(self, config_name: str = None) -> Optional[FacetIndex]:
+        """Get the facet index for a configuration, loading it if needed."""
         if config_name is None:
             config_name = self.user_preferences.active_config
 
-        config_file = self.config_path / config_name
-        if not config_file.exists():
+        return self._snapshot_for(config_name).facets.get(config_name)
+
+    def get_palette_index(self, config_name: str = None) -> Optional[PaletteIndex]:
+        """Get the command palette index for a configuration."""
+        if config_name is None:
+            config_name = self.user_preferences.active_config
+
+        config, version = self.load_config_with_version(config_name)
+        if config is None or version is None:
             return None
 
-        try:
-            with open(config_file, "r") as f:
-                data = yaml.safe_load(f)
-                return DashboardConfig.from_dict(data)
-        except (yaml.YAMLError, KeyError) as e:
-            print(f"Error loading config {config_name}: {e}")
+        index = self.palette_indexes.get(config_name)
+        if index is None or index.version != version:
+            index = build_palette_index(config, version)
+            self.palette_indexes[config_name] = index
+        return index
+
+    def get_aggregate(self) -> AggregateView:
+        """Get the merged view of every configuration.
+
+        The view is brought in line with the current snapshot; only configs
+        whose version changed are re-merged.
+        """
+        snapshot = self.snapshot
+        for config_name, config in snapshot.configs.items():
+            self.aggregate.update(config_name, snapshot.versions[config_name], config)
+
+        for config_name in set(self.aggregate.configs) - set(snapshot.configs):
+            self.aggregate.remove(config_name)
+        return self.aggregate
+
+    def on_config_file_changed(self, config_name: str):
+        """Schedule a reload after a config file changed on disk."""
+        self.reload([config_name], wait=False)
+
+    def get_config_version(self, config_name: str = None) -> Optional[str]:
+        """Get the version hash of a configuration in the current snapshot."""
+        return self.load_config_with_version(config_name)[1]
+
+    def load_config_delta(self, since: str, config_name: str = None) -> Optional[Dict]:
+        """Load a configuration as a patch against an earlier version.
+
+        Falls back to the full document when the base version has aged out
+        of the history ring or cannot be diffed structurally.
+        """
+        if config_name is None:
+            config_name = self.user_preferences.active_config
+
+        config, version = self.load_config_with_version(config_name)
+        if config is None or version is None:
             return None
 
+        history = self.history.get(config_name) or ConfigHistory()
+        current = history.get(version) or config.to_dict()
+        base = history.get(since)
+
+        patch = diff_configs(base, current) if base is not None else None
+        if patch is None:
+            return {"type": "full", "version": version, "config": current}
+
+        return {"type": "patch", "base": since, "version": version, "patch": patch}
+
     def save_config(self, config: DashboardConfig, config_name: str):
         """Save a configuration to a YAML file."""
+        journal = self.journals.get(config_name)
+        if journal is not None:
+            journal.replace(config)
+        else:
+            config_file = self.config_path / config_name
+            content = yaml.dump(config.to_dict(), default_flow_style=False, indent=2)
+            atomic_write(config_file, content.encode("utf-8"))
+        self.reload([config_name])
+
+    def get_journal(self, config_name: str) -> ConfigJournal:
+        """Get the edit journal for a local config, creating it on first use.
+
+        A new journal starts from the config in the published snapshot, so
+        the file is not parsed again on the request thread. If the snapshot
+        is behind the file, the reloader thread catches it up first.
+        """
+        with self._journals_lock:
+            journal = self.journals.get(config_name)
+            if journal is None:
+                config_file = self._local_config_file(config_name)
+                snapshot = self.snapshot
+                if snapshot.stats.get(config_name) != file_stat(config_file):
+                    snapshot = self.reloader.reload([config_name])
+                journal = ConfigJournal(
+                    config_file,
+                    self.journal_dir / f"{config_name}.jsonl",
+                    base_config=snapshot.configs.get(config_name),
+                    base_stat=snapshot.stats.get(config_name),
+                )
+                self.journals[config_name] = journal
+            return journal
+
+    def _local_config_file(self, config_name: str) -> Path:
+        """Get the local YAML file of a config that can be edited."""
         config_file = self.config_path / config_name
-        with open(config_file, "w") as f:
-            yaml.dump(config.to_dict(), f, default_flow_style=False, indent=2)
+        if Path(config_name).name != config_name or not config_file.exists():
+            raise LookupError(f"Configuration not found: {config_name}")
+        return config_file
+
+    def edit_config(self, config_name: str, op: Dict) -> Optional[str]:
+        """Apply a single journaled edit to a config and return its new version."""
+        journal = self.get_journal(config_name)
+        if journal.stale:
+            # The file changed outside navspec; reloading reads it into the
+            # journal on the reloader thread rather than here
+            self.reload([config_name])
+        journal.apply(op)
+        self.reload([config_name])
+        return self.get_config_version(config_name)
+
+    def _recover_journals(self):
+        """Replay journals left behind by a previous run.
+
+        Runs before the first snapshot is built, so the files are parsed here.
+        """
+        if not self.journal_dir.exists():
+            return
+
+        for journal_file in self.journal_dir.glob("*.jsonl"):
+            config_name = journal_file.name[: -len(".jsonl")]
+            try:
+                config_file = self._local_config_file(config_name)
+                self.journals[config_name] = ConfigJournal(config_file, journal_file)
+            except (LookupError, OSError, yaml.YAMLError) as e:
+                print(f"Error recovering journal {journal_file.name}: {e}")
+
+    def flush_journals(self):
+        """Compact all pending journaled edits into their YAML files."""
+        for journal in list(self.journals.values()):
+            journal.close()
 
     def update_user_preferences(self, **kwargs):
         """Update user preferences."""
+        active_config = kwargs.get("active_config")
+        if active_config is not None and (
+            not isinstance(active_config, str)
+            or self._resolve_config_file(active_config) is None
+        ):
+            raise ValueError(f"Configuration not found: {active_config}")
+
         for key, value in kwargs.items():
             if hasattr(self.user_preferences, key):
                 setattr(self.user_preferences, key, value)
@@ -144,7 +503,7 @@ class ConfigManager:
             available_configs=self.get_available_configs(),
         )
 
-    def _start_file_watching(self):
+    def start_file_watching(self):
         """Start watching for configuration file changes."""
         if self.observer is None:
             self.observer = Observer()
@@ -159,6 +518,21 @@ class ConfigManager:
         if self.observer:
             self.observer.stop()
             self.observer.join()
+            self.observer = None
+
+    def stop_reloading(self):
+        """Stop the background reloader thread."""
+        self.reloader.stop()
+
+    def stop_remote_refresh(self):
+        """Stop refreshing remote config sources."""
+        if self.scheduler:
+            self.scheduler.stop()
+
+    def _on_source_change(self, source: ConfigSource):
+        """Handle a remote source publishing new configuration files."""
+        print(f"Remote configuration updated: {source.spec}")
+        self.reload(wait=False)
 
 
 class ConfigFileHandler(FileSystemEventHandler):
@@ -171,5 +545,18 @@ class ConfigFileHandler(FileSystemEventHandler):
         """Handle file modification events."""
         if not event.is_directory and event.src_path.endswith(".yaml"):
             print(f"Configuration file changed: {event.src_path}")
-            # In future versions, we might want to notify the server
-            # to reload the configuration or refresh the UI
+            self.config_manager.on_config_file_changed(Path(event.src_path).name)
+
+    def on_created(self, event):
+        """Handle new configuration files."""
+        self.on_modified(event)
+
+    def on_deleted(self, event):
+        """Handle configuration files being removed."""
+        self.on_modified(event)
+
+    def on_moved(self, event):
+        """Handle files being renamed into place, as atomic writes do."""
+        if not event.is_directory and event.dest_path.endswith(".yaml"):
+            print(f"Configuration file changed: {event.dest_path}")
+            self.config_manager.on_config_file_changed(Path(event.dest_path).name)
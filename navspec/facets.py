@@ -0,0 +1,286 @@
+"""Tag and status facet index for navspec dashboards.
+
+Each link is assigned a slot, and facet membership is stored as a Python
+int used as a bitset over slots. Boolean filter expressions then resolve
+to a handful of bitwise operations regardless of the number of links.
+"""
+
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .types import DashboardConfig, Link
+
+LinkKey = Tuple[str, str, int]
+
+# Deepest nesting of parentheses and NOTs accepted in a filter expression
+MAX_QUERY_DEPTH = 64
+
+_TOKEN_RE = re.compile(r"\s*(\(|\)|!=|=|:|[^\s()!=:]+)")
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+class FacetIndex:
+    """Bitset index of link tags and status for one configuration.
+
+    Links are keyed by (category name, link name, occurrence), so links
+    sharing a name within a category are indexed separately. Keys keep
+    their slot for as long as they exist, so updating the index after a
+    file change only touches the bits of links that were added, removed or
+    edited.
+    """
+
+    def __init__(self, config: Optional[DashboardConfig] = None):
+        self.slots: Dict[LinkKey, int] = {}
+        self.links: Dict[int, Tuple[str, Link]] = {}
+        self.order: List[int] = []
+        self.tags: Dict[str, int] = {}
+        self.status: Dict[str, int] = {}
+        self.tag_counts: Dict[str, int] = {}
+        self.status_counts: Dict[str, int] = {}
+        self.all = 0
+        self._free: List[int] = []
+        self._lock = threading.Lock()
+
+        if config is not None:
+            self.update(config)
+
+    def copy(self) -> "FacetIndex":
+        """Return an independent index to update without touching this one."""
+        with self._lock:
+            index = FacetIndex()
+            index.slots = dict(self.slots)
+            index.links = dict(self.links)
+            index.order = list(self.order)
+            index.tags = dict(self.tags)
+            index.status = dict(self.status)
+            index.tag_counts = dict(self.tag_counts)
+            index.status_counts = dict(self.status_counts)
+            index.all = self.all
+            index._free = list(self._free)
+            return index
+
+    @staticmethod
+    def _facets(link: Link) -> Tuple[frozenset, str]:
+        tags = frozenset(tag.lower() for tag in link.tags or [])
+        return tags, (link.status or "active").lower()
+
+    def _set_bits(self, slot: int, link: Link, touched_tags, touched_status):
+        tags, status = self._facets(link)
+        bit = 1 << slot
+        for tag in tags:
+            self.tags[tag] = self.tags.get(tag, 0) | bit
+            touched_tags.add(tag)
+        self.status[status] = self.status.get(status, 0) | bit
+        touched_status.add(status)
+        self.all |= bit
+
+    def _clear_bits(self, slot: int, link: Link, touched_tags, touched_status):
+        tags, status = self._facets(link)
+        bit = ~(1 << slot)
+        for tag in tags:
+            self.tags[tag] &= bit
+            touched_tags.add(tag)
+        self.status[status] &= bit
+        touched_status.add(status)
+        self.all &= bit
+
+    def update(self, config: DashboardConfig) -> int:
+        """Bring the index in line with a configuration.
+
+        Returns the number of links whose bits changed.
+        """
+        with self._lock:
+            return self._update(config)
+
+    def _update(self, config: DashboardConfig) -> int:
+        touched_tags: set = set()
+        touched_status: set = set()
+        seen = set()
+        occurrences: Dict[Tuple[str, str], int] = {}
+        order = []
+        changed = 0
+
+        for category in config.categories:
+            for link in category.links:
+                occurrence = occurrences.get((category.name, link.name), 0)
+                occurrences[(category.name, link.name)] = occurrence + 1
+                key = (category.name, link.name, occurrence)
+                seen.add(key)
+
+                slot = self.slots.get(key)
+                if slot is None:
+                    slot = self._free.pop() if self._free else len(self.slots)
+                    while slot in self.links:
+                        slot += 1
+                    self.slots[key] = slot
+                    self._set_bits(slot, link, touched_tags, touched_status)
+                    changed += 1
+                else:
+                    previous = self.links[slot][1]
+                    if self._facets(previous) != self._facets(link):
+                        self._clear_bits(slot, previous, touched_tags, touched_status)
+                        self._set_bits(slot, link, touched_tags, touched_status)
+                        changed += 1
+
+                self.links[slot] = (category.name, link)
+                order.append(slot)
+
+        for key in [key for key in self.slots if key not in seen]:
+            slot = self.slots.pop(key)
+            self._clear_bits(
+                slot, self.links.pop(slot)[1], touched_tags, touched_status
+            )
+            self._free.append(slot)
+            changed += 1
+
+        self.order = order
+        self._recount(self.tags, self.tag_counts, touched_tags)
+        self._recount(self.status, self.status_counts, touched_status)
+        return changed
+
+    @staticmethod
+    def _recount(masks: Dict[str, int], counts: Dict[str, int], touched):
+        for name in touched:
+            count = _popcount(masks.get(name, 0))
+            if count:
+                counts[name] = count
+            else:
+                counts.pop(name, None)
+                masks.pop(name, None)
+
+    def facet_counts(self) -> Dict:
+        """Return precomputed link counts per tag and status."""
+        with self._lock:
+            return {
+                "total": len(self.order),
+                "tags": dict(sorted(self.tag_counts.items())),
+                "status": dict(sorted(self.status_counts.items())),
+            }
+
+    def filter(self, query: str) -> List[Dict]:
+        """Return the links matching a boolean facet expression, in config order."""
+        with self._lock:
+            mask = self.evaluate(query)
+            return [
+                dict(self.links[slot][1].to_dict(), category=self.links[slot][0])
+                for slot in self.order
+                if mask >> slot & 1
+            ]
+
+    def evaluate(self, query: str) -> int:
+        """Resolve a boolean facet expression to a bitset of matching slots.
+
+        Supported syntax::
+
+            production AND grafana AND status != down
+            (tag:staging OR tag:dev) AND NOT status:maintenance
+
+        Bare words match tags. ``status:x`` and ``status = x`` match a status,
+        ``status != x`` excludes one. Tags named ``and``, ``or`` or ``not``
+        read as operators when bare, so query them as ``tag:and``. An empty
+        query matches every link.
+        """
+        tokens = _TOKEN_RE.findall(query)
+        if not tokens:
+            return self.all
+
+        parser = _QueryParser(self, tokens)
+        mask = parser.parse()
+        return mask & self.all
+
+
+class _QueryParser:
+    """Recursive-descent parser evaluating facet expressions to bitsets."""
+
+    def __init__(self, index: FacetIndex, tokens: List[str]):
+        self.index = index
+        self.tokens = tokens
+        self.pos = 0
+        self.depth = 0
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _next(self) -> str:
+        token = self._peek()
+        if token is None:
+            raise ValueError("Unexpected end of filter expression")
+        self.pos += 1
+        return token
+
+    def _keyword(self, word: str) -> bool:
+        token = self._peek()
+        if token is not None and token.upper() == word:
+            self.pos += 1
+            return True
+        return False
+
+    def _nested(self, parse: Callable[[], int]) -> int:
+        """Parse a nested expression, bounding recursion depth."""
+        if self.depth >= MAX_QUERY_DEPTH:
+            raise ValueError("Filter expression is nested too deeply")
+        self.depth += 1
+        try:
+            return parse()
+        finally:
+            self.depth -= 1
+
+    def parse(self) -> int:
+        mask = self._or()
+        if self._peek() is not None:
+            raise ValueError(f"Unexpected token in filter: {self._peek()}")
+        return mask
+
+    def _or(self) -> int:
+        mask = self._and()
+        while self._keyword("OR"):
+            mask |= self._and()
+        return mask
+
+    def _and(self) -> int:
+        mask = self._not()
+        while True:
+            if self._keyword("AND"):
+                mask &= self._not()
+            else:
+                token = self._peek()
+                if token is None or token == ")" or token.upper() == "OR":
+                    return mask
+                # Adjacent terms are implicitly ANDed
+                mask &= self._not()
+
+    def _not(self) -> int:
+        if self._keyword("NOT"):
+            return self.index.all & ~self._nested(self._not)
+        return self._term()
+
+    def _term(self) -> int:
+        token = self._next()
+        if token == "(":
+            mask = self._nested(self._or)
+            if self._next() != ")":
+                raise ValueError("Unbalanced parentheses in filter")
+            return mask
+        if token in (")", ":", "=", "!="):
+            raise ValueError(f"Unexpected token in filter: {token}")
+
+        operator = self._peek()
+        if operator in (":", "=", "!="):
+            self.pos += 1
+            value = self._next().lower()
+            facet = token.lower()
+            if facet == "status":
+                masks = self.index.status
+            elif facet in ("tag", "tags"):
+                masks = self.index.tags
+            else:
+                raise ValueError(f"Unknown facet in filter: {token}")
+
+            mask = masks.get(value, 0)
+            return self.index.all & ~mask if operator == "!=" else mask
+
+        return self.index.tags.get(token.lower(), 0)
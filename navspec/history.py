@@ -0,0 +1,160 @@
+"""Versioned configuration snapshots and structural diffs for navspec."""
+
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+# Number of recent versions kept per configuration file
+HISTORY_SIZE = 8
+
+
+def config_version(data: Dict[str, Any]) -> str:
+    """Return a stable content hash for a serialized configuration."""
+    payload = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class ConfigHistory:
+    """A small ring of recent versions of a single configuration."""
+
+    def __init__(self, size: int = HISTORY_SIZE):
+        self.size = size
+        self._versions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    @property
+    def latest(self) -> Optional[str]:
+        """Version hash of the most recently recorded snapshot."""
+        if not self._versions:
+            return None
+        return next(reversed(self._versions))
+
+    def record(self, data: Dict[str, Any]) -> str:
+        """Record a snapshot and return its version hash."""
+        version = config_version(data)
+        if version in self._versions:
+            # Reverting to an earlier version makes it the latest again
+            self._versions.move_to_end(version)
+        else:
+            self._versions[version] = data
+            while len(self._versions) > self.size:
+                self._versions.popitem(last=False)
+        return version
+
+    def get(self, version: str) -> Optional[Dict[str, Any]]:
+        """Return the snapshot for a version, or None if it has aged out."""
+        return self._versions.get(version)
+
+    def __iter__(self):
+        return iter(list(self._versions))
+
+    def __contains__(self, version: str) -> bool:
+        return version in self._versions
+
+    def __len__(self) -> int:
+        return len(self._versions)
+
+
+def _index_by_name(items: List[Dict[str, Any]]) -> Optional[Dict[str, Dict]]:
+    """Index items by name, or return None if names are not unique."""
+    index = {}
+    for item in items:
+        if item["name"] in index:
+            return None
+        index[item["name"]] = item
+    return index
+
+
+def _diff_links(
+    old_links: List[Dict[str, Any]], new_links: List[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """Diff two link lists keyed by link name."""
+    old_index = _index_by_name(old_links)
+    new_index = _index_by_name(new_links)
+    if old_index is None or new_index is None:
+        return None
+
+    return {
+        "added": [link for name, link in new_index.items() if name not in old_index],
+        "removed": [name for name in old_index if name not in new_index],
+        "changed": [
+            link
+            for name, link in new_index.items()
+            if name in old_index and old_index[name] != link
+        ],
+        "order": [link["name"] for link in new_links],
+    }
+
+
+def diff_configs(old: Dict[str, Any], new: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Compute a structural diff between two serialized configurations.
+
+    Categories are keyed by name and links by name within their category.
+    Returns None when names are ambiguous and the caller should fall back
+    to sending the full document.
+    """
+    old_index = _index_by_name(old["categories"])
+    new_index = _index_by_name(new["categories"])
+    if old_index is None or new_index is None:
+        return None
+
+    added = []
+    changed = []
+    for name, category in new_index.items():
+        if name not in old_index:
+            added.append(category)
+            continue
+
+        previous = old_index[name]
+        if previous == category:
+            continue
+
+        links = _diff_links(previous["links"], category["links"])
+        if links is None:
+            return None
+
+        changed.append(
+            {
+                "name": name,
+                "description": category["description"],
+                "icon": category["icon"],
+                "links": links,
+            }
+        )
+
+    return {
+        "metadata": new["metadata"] if old["metadata"] != new["metadata"] else None,
+        "categories": {
+            "added": added,
+            "removed": [name for name in old_index if name not in new_index],
+            "changed": changed,
+            "order": [category["name"] for category in new["categories"]],
+        },
+    }
+
+
+def apply_patch(base: Dict[str, Any], patch: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply a diff produced by diff_configs and return the new document.
+
+    Mirrors the client-side patching in app.js; mainly used to verify patches.
+    """
+    categories = {category["name"]: category for category in base["categories"]}
+    for category in patch["categories"]["added"]:
+        categories[category["name"]] = category
+
+    for change in patch["categories"]["changed"]:
+        links = {link["name"]: link for link in categories[change["name"]]["links"]}
+        for link in change["links"]["added"] + change["links"]["changed"]:
+            links[link["name"]] = link
+
+        categories[change["name"]] = {
+            "name": change["name"],
+            "description": change["description"],
+            "icon": change["icon"],
+            "links": [links[name] for name in change["links"]["order"]],
+        }
+
+    return {
+        "metadata": patch["metadata"] or base["metadata"],
+        "categories": [categories[name] for name in patch["categories"]["order"]],
+    }
@@ -0,0 +1,304 @@
+"""Favicon fetching, caching and sprite sheets for navspec dashboards.
+
+Favicons for link hosts are fetched in the background by a bounded thread
+pool and stored in a content-addressed cache under ``.navspec/icons``. Each
+configuration gets a single SVG sprite sheet embedding its icons, plus a
+CSS file mapping hosts to offsets, so a page load costs one image request
+no matter how many links it has. Sheets are rebuilt only when the set of
+hosts (or the icons available for them) changes.
+"""
+
+import base64
+import hashlib
+import http.client
+import json
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from .sources import atomic_write
+from .types import DashboardConfig
+
+# Default favicon location for an origin; point this at a local stand-in to
+# run without network access
+DEFAULT_URL_TEMPLATE = "{origin}/favicon.ico"
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+MAX_WORKERS = 8
+FETCH_TIMEOUT = 5
+MAX_ICON_BYTES = 100 * 1024
+
+# Seconds before retrying a host whose favicon could not be fetched
+MISSING_TTL = 24 * 3600
+
+ICON_SIZE = 16
+SPRITE_COLUMNS = 32
+
+_MAGIC = [
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\x00\x00\x01\x00", "image/x-icon"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"RIFF", "image/webp"),
+]
+
+
+def sniff_image_type(data: bytes) -> Optional[str]:
+    """Return the MIME type of supported image data, or None."""
+    for magic, mime in _MAGIC:
+        if data.startswith(magic):
+            return mime
+    head = data[:256].lstrip().lower()
+    if head.startswith(b"<svg") or (head.startswith(b"<?xml") and b"<svg" in head):
+        return "image/svg+xml"
+    return None
+
+
+def link_origins(config: DashboardConfig) -> Dict[str, str]:
+    """Map each http(s) host in a configuration to its origin.
+
+    Hosts are written the way the browser's ``URL.host`` writes them, which
+    omits the scheme's default port, so they match the dashboard's
+    ``data-host`` attributes.
+    """
+    origins: Dict[str, str] = {}
+    for category in config.categories:
+        for link in category.links:
+            parts = urllib.parse.urlsplit(link.url)
+            try:
+                port = parts.port
+            except ValueError:
+                continue
+            if parts.scheme in DEFAULT_PORTS and parts.hostname:
+                host = parts.hostname
+                if ":" in host:
+                    host = f"[{host}]"
+                if port and port != DEFAULT_PORTS[parts.scheme]:
+                    host += f":{port}"
+                origins.setdefault(host, f"{parts.scheme}://{host}")
+    return origins
+
+
+class IconCache:
+    """Content-addressed on-disk store of favicons.
+
+    Icon bytes live in ``objects/<sha256>``; ``index.json`` maps each host to
+    its icon hash and MIME type, or records when a fetch last failed.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.objects_dir = root / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.index_file = root / "index.json"
+        self._lock = threading.Lock()
+        self.index: Dict[str, Dict] = self._load_index()
+
+    def _load_index(self) -> Dict[str, Dict]:
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, "r") as f:
+                    index: Dict[str, Dict] = json.load(f)
+                    return index
+            except json.JSONDecodeError:
+                pass
+        return {}
+
+    def _save_index(self):
+        atomic_write(self.index_file, json.dumps(self.index, indent=2).encode("utf-8"))
+
+    def lookup(self, host: str) -> Optional[Tuple[str, str]]:
+        """Return the (hash, MIME type) of a host's icon, if cached."""
+        entry = self.index.get(host)
+        if entry and entry.get("sha"):
+            return entry["sha"], entry["mime"]
+        return None
+
+    def needs_fetch(self, host: str) -> bool:
+        entry = self.index.get(host)
+        if entry is None:
+            return True
+        if entry.get("sha"):
+            return False
+        return time.time() - float(entry.get("failed_at", 0)) > MISSING_TTL
+
+    def put(self, host: str, data: bytes, mime: str) -> str:
+        """Store icon bytes for a host and return their content hash."""
+        sha = hashlib.sha256(data).hexdigest()
+        path = self.objects_dir / sha
+        if not path.exists():
+            atomic_write(path, data)
+        with self._lock:
+            self.index[host] = {"sha": sha, "mime": mime}
+            self._save_index()
+        return sha
+
+    def mark_missing(self, host: str):
+        """Record that a host has no usable favicon for now."""
+        with self._lock:
+            self.index[host] = {"sha": None, "failed_at": time.time()}
+            self._save_index()
+
+    def read(self, sha: str) -> bytes:
+        return (self.objects_dir / sha).read_bytes()
+
+
+class IconFetcher:
+    """Fetches favicons concurrently with a bounded thread pool."""
+
+    def __init__(
+        self,
+        cache: IconCache,
+        url_template: str = DEFAULT_URL_TEMPLATE,
+        max_workers: int = MAX_WORKERS,
+    ):
+        self.cache = cache
+        self.url_template = url_template
+        self.pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="navspec-icons"
+        )
+        self._in_flight: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def fetch_missing(self, origins: Dict[str, str]) -> List:
+        """Queue fetches for hosts without a cached icon; returns the futures."""
+        futures = []
+        with self._lock:
+            for host, origin in origins.items():
+                if host in self._in_flight or not self.cache.needs_fetch(host):
+                    continue
+                self._in_flight.add(host)
+                futures.append(self.pool.submit(self._fetch, host, origin))
+        return futures
+
+    def _fetch(self, host: str, origin: str):
+        url = self.url_template.format(origin=origin, host=host)
+        try:
+            with urllib.request.urlopen(url, timeout=FETCH_TIMEOUT) as response:
+                data = response.read(MAX_ICON_BYTES + 1)
+            mime = sniff_image_type(data)
+            if len(data) > MAX_ICON_BYTES or mime is None:
+                self.cache.mark_missing(host)
+            else:
+                self.cache.put(host, data, mime)
+        except (
+            urllib.error.URLError,
+            http.client.HTTPException,
+            OSError,
+            ValueError,
+        ):
+            self.cache.mark_missing(host)
+        finally:
+            with self._lock:
+                self._in_flight.discard(host)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False)
+
+
+class SpriteSheet:
+    """An SVG sprite sheet and CSS offset map for a set of host icons."""
+
+    def __init__(self, key: str, svg: str, css: str, offsets: Dict[str, List[int]]):
+        self.key = key
+        self.svg = svg
+        self.css = css
+        self.offsets = offsets
+
+
+def build_sprite(
+    icons: List[Tuple[str, str, bytes]], sprite_url: str, key: str
+) -> SpriteSheet:
+    """Pack (host, MIME type, bytes) icons into an SVG sprite sheet.
+
+    Icons are embedded as data URIs on a fixed grid, which lets browsers
+    draw any supported image format without navspec decoding images.
+    """
+    columns = max(1, min(SPRITE_COLUMNS, len(icons)))
+    rows = max(1, -(-len(icons) // columns))
+    width, height = columns * ICON_SIZE, rows * ICON_SIZE
+
+    images = []
+    offsets = {}
+    rules = [
+        ".favicon { display: none; width: %dpx; height: %dpx; "
+        "background-image: url('%s'); background-size: %dpx %dpx; "
+        "background-repeat: no-repeat; }"
+        % (ICON_SIZE, ICON_SIZE, sprite_url, width, height)
+    ]
+    for i, (host, mime, data) in enumerate(icons):
+        x, y = (i % columns) * ICON_SIZE, (i // columns) * ICON_SIZE
+        offsets[host] = [x, y]
+        encoded = base64.b64encode(data).decode("ascii")
+        images.append(
+            f'<image x="{x}" y="{y}" width="{ICON_SIZE}" height="{ICON_SIZE}" '
+            f'href="data:{mime};base64,{encoded}"/>'
+        )
+        selector = json.dumps(host)
+        rules.append(
+            f".favicon[data-host={selector}] "
+            f"{{ display: inline-block; background-position: -{x}px -{y}px; }}"
+        )
+
+    svg = (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}">' + "".join(images) + "</svg>"
+    )
+    return SpriteSheet(key, svg, "\n".join(rules) + "\n", offsets)
+
+
+class IconManager:
+    """Keeps favicons fetched and a sprite sheet current for each config."""
+
+    def __init__(
+        self,
+        root: Path,
+        url_template: str = DEFAULT_URL_TEMPLATE,
+        max_workers: int = MAX_WORKERS,
+    ):
+        self.cache = IconCache(root)
+        self.fetcher = IconFetcher(self.cache, url_template, max_workers)
+        self.sprites: Dict[str, SpriteSheet] = {}
+        self._lock = threading.Lock()
+
+    def sprite_for(self, config_name: str, config: DashboardConfig) -> SpriteSheet:
+        """Return the sprite sheet for a config, fetching missing icons.
+
+        Missing icons are fetched in the background and appear in the sheet
+        on a later call; this never blocks on the network.
+        """
+        origins = link_origins(config)
+        self.fetcher.fetch_missing(origins)
+
+        available = []
+        for host in sorted(origins):
+            entry = self.cache.lookup(host)
+            if entry is not None:
+                available.append((host, entry[0], entry[1]))
+
+        key = hashlib.sha256(
+            json.dumps([[host, sha] for host, sha, _ in available]).encode("utf-8")
+        ).hexdigest()[:16]
+
+        with self._lock:
+            sprite = self.sprites.get(config_name)
+            if sprite is None or sprite.key != key:
+                sprite_url = "/api/icons/sprite.svg?" + urllib.parse.urlencode(
+                    {"config_name": config_name, "v": key}
+                )
+                icons = [
+                    (host, mime, self.cache.read(sha)) for host, sha, mime in available
+                ]
+                sprite = build_sprite(icons, sprite_url, key)
+                self.sprites[config_name] = sprite
+            return sprite
+
+    def shutdown(self):
+        self.fetcher.shutdown()
@@ -0,0 +1,404 @@
+"""Journaled, fine-grained edits to dashboard configuration files.
+
+Edits are applied to an in-memory DashboardConfig immediately and appended
+to a per-file journal in ``.navspec/journal/``. A background timer compacts
+the journal into the YAML file with an atomic rename, so a crash at any
+point leaves either the old or the new file plus a replayable journal.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import yaml
+
+from .sources import atomic_write
+from .types import Category, DashboardConfig, Link
+
+# Seconds to wait after an edit before compacting the journal into the YAML file
+COMPACT_DELAY = 2.0
+
+LINK_FIELDS = ("name", "url", "description", "tags", "status", "icon")
+CATEGORY_FIELDS = ("name", "description", "icon")
+
+LINK_DEFAULTS = {"description": "", "tags": []}
+
+
+class JournalError(Exception):
+    """Raised when the journal cannot be written or replayed."""
+
+
+def _file_hash(path: Path) -> Optional[str]:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def file_stat(path: Path) -> Optional[tuple]:
+    """Cheap signature used to notice edits made outside navspec."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def _find_category(config: DashboardConfig, name: str) -> Category:
+    for category in config.categories:
+        if category.name == name:
+            return category
+    raise LookupError(f"Category not found: {name}")
+
+
+def _find_link(category: Category, name: str) -> Link:
+    for link in category.links:
+        if link.name == name:
+            return link
+    raise LookupError(f"Link not found: {category.name}/{name}")
+
+
+def _require_object(value: Any, what: str) -> Dict[str, Any]:
+    if not isinstance(value, dict):
+        raise ValueError(f"{what} must be an object")
+    return value
+
+
+def _check_values(fields: Dict[str, Any]) -> None:
+    """Check the types of link and category field values."""
+    for key, value in fields.items():
+        if key in ("name", "url", "description", "status"):
+            valid = isinstance(value, str)
+        elif key == "icon":
+            valid = value is None or isinstance(value, str)
+        elif key == "tags":
+            valid = isinstance(value, list) and all(isinstance(t, str) for t in value)
+        else:
+            continue
+        if not valid:
+            raise ValueError(f"Invalid value for {key}: {value!r}")
+
+
+def _check_fields(fields: Any, allowed) -> Dict[str, Any]:
+    checked = _require_object(fields, "fields")
+    unknown = set(checked) - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    _check_values(checked)
+    return checked
+
+
+def _link_data(link: Any) -> Dict[str, Any]:
+    """Fill in link defaults and check the values of a link object."""
+    data = dict(copy.deepcopy(LINK_DEFAULTS), **_require_object(link, "link"))
+    _check_values(data)
+    return data
+
+
+def _check_position(position: Any) -> None:
+    if position is not None and (
+        not isinstance(position, int) or isinstance(position, bool)
+    ):
+        raise ValueError(f"Invalid position: {position!r}")
+
+
+def _insert(items: List, item, position: Optional[int]) -> None:
+    if position is None:
+        items.append(item)
+    else:
+        items.insert(max(0, min(position, len(items))), item)
+
+
+def _build(cls, data: Dict[str, Any]):
+    try:
+        return cls.from_dict(data)
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Invalid {cls.__name__.lower()}: missing {e}") from e
+
+
+def apply_operation(config: DashboardConfig, op: Dict[str, Any]) -> None:
+    """Apply a single journal operation to a configuration in place.
+
+    Operations, including the types of field values, are validated before
+    anything is mutated, so a failing operation leaves the configuration
+    unchanged. Raises LookupError for missing categories or links and
+    ValueError for invalid operations.
+    """
+    kind = op.get("op")
+    _check_position(op.get("position"))
+
+    if kind == "add_category":
+        data = dict(
+            {"description": "", "links": []},
+            **_require_object(op["category"], "category"),
+        )
+        _check_values(data)
+        if not isinstance(data["links"], list):
+            raise ValueError("links must be a list")
+        data["links"] = [_link_data(link) for link in data["links"]]
+        category = _build(Category, data)
+        if any(c.name == category.name for c in config.categories):
+            raise ValueError(f"Category already exists: {category.name}")
+        _insert(config.categories, category, op.get("position"))
+
+    elif kind == "update_category":
+        category = _find_category(config, op["category"])
+        fields = _check_fields(op["fields"], CATEGORY_FIELDS)
+        new_name = fields.get("name", category.name)
+        if new_name != category.name and any(
+            c.name == new_name for c in config.categories
+        ):
+            raise ValueError(f"Category already exists: {new_name}")
+        for key, value in fields.items():
+            setattr(category, key, value)
+
+    elif kind == "move_category":
+        category = _find_category(config, op["category"])
+        config.categories.remove(category)
+        _insert(config.categories, category, op["position"])
+
+    elif kind == "delete_category":
+        config.categories.remove(_find_category(config, op["category"]))
+
+    elif kind == "add_link":
+        category = _find_category(config, op["category"])
+        link = _build(Link, _link_data(op["link"]))
+        if any(existing.name == link.name for existing in category.links):
+            raise ValueError(f"Link already exists: {category.name}/{link.name}")
+        _insert(category.links, link, op.get("position"))
+
+    elif kind == "update_link":
+        category = _find_category(config, op["category"])
+        link = _find_link(category, op["link"])
+        fields = _check_fields(op["fields"], LINK_FIELDS)
+        new_name = fields.get("name", link.name)
+        if new_name != link.name and any(
+            existing.name == new_name for existing in category.links
+        ):
+            raise ValueError(f"Link already exists: {category.name}/{new_name}")
+        for key, value in fields.items():
+            setattr(link, key, value)
+
+    elif kind == "move_link":
+        source = _find_category(config, op["category"])
+        link = _find_link(source, op["link"])
+        target = _find_category(config, op.get("to_category") or source.name)
+        if target is not source and any(
+            existing.name == link.name for existing in target.links
+        ):
+            raise ValueError(f"Link already exists: {target.name}/{link.name}")
+        source.links.remove(link)
+        _insert(target.links, link, op.get("position"))
+
+    elif kind == "delete_link":
+        category = _find_category(config, op["category"])
+        category.links.remove(_find_link(category, op["link"]))
+
+    else:
+        raise ValueError(f"Unknown operation: {kind}")
+
+
+class ConfigJournal:
+    """In-memory model of one config file backed by an append-only journal.
+
+    All edits to the file go through ``apply``, which serializes them with a
+    per-file lock. The journal starts with a header recording the hash of
+    the YAML file it applies to; compaction appends a ``compact`` marker
+    before renaming the new YAML into place, so replay after a crash can
+    tell whether the journal has already been folded into the file. A
+    journal whose base no longer matches the file is set aside rather
+    than replayed onto a file it was not written against.
+
+    A ``base_config`` already parsed from the file, with the file signature
+    ``base_stat`` it was parsed at, spares parsing the YAML again while the
+    file is unchanged. It is copied, never modified.
+    """
+
+    def __init__(
+        self,
+        config_file: Path,
+        journal_file: Path,
+        compact_delay: float = COMPACT_DELAY,
+        on_compact: Optional[Callable[["ConfigJournal"], None]] = None,
+        base_config: Optional[DashboardConfig] = None,
+        base_stat: Optional[tuple] = None,
+    ):
+        self.config_file = config_file
+        self.journal_file = journal_file
+        self.compact_delay = compact_delay
+        self.on_compact = on_compact
+
+        self.lock = threading.RLock()
+        self.config: DashboardConfig
+        self.pending: List[Dict[str, Any]] = []
+        self._file_hash: Optional[str] = None
+        self._file_stat: Optional[tuple] = None
+        self._timer: Optional[threading.Timer] = None
+
+        self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            self._recover(base_config, base_stat)
+
+    def _read_config(self) -> DashboardConfig:
+        with open(self.config_file, "r") as f:
+            return DashboardConfig.from_dict(yaml.safe_load(f))
+
+    def _read_journal(self) -> List[Dict[str, Any]]:
+        if not self.journal_file.exists():
+            return []
+
+        entries = []
+        with open(self.journal_file, "r") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-append
+                    break
+        return entries
+
+    def _recover(
+        self,
+        base_config: Optional[DashboardConfig] = None,
+        base_stat: Optional[tuple] = None,
+    ):
+        """Load the YAML file and replay any journal left from a previous run."""
+        stat = file_stat(self.config_file)
+        if base_config is not None and stat is not None and stat == base_stat:
+            config = DashboardConfig.from_dict(base_config.to_dict())
+        else:
+            config = self._read_config()
+        self.config = config
+        self._file_hash = _file_hash(self.config_file)
+        self._file_stat = stat
+        self.pending = []
+
+        entries = self._read_journal()
+        base = entries[0].get("base") if entries else None
+        ops = [entry for entry in entries if "op" in entry and entry["op"] != "compact"]
+        compacted = [entry for entry in entries if entry.get("op") == "compact"]
+
+        if compacted and compacted[-1]["hash"] == self._file_hash:
+            # Crashed after the rename but before the journal was reset
+            ops = []
+        elif ops and base != self._file_hash:
+            # The file changed since the journal was started, so its edits
+            # may not apply; keep them for inspection instead
+            rejected = self.journal_file.with_name(self.journal_file.name + ".rejected")
+            os.replace(self.journal_file, rejected)
+            print(
+                f"{self.config_file.name} changed outside navspec; "
+                f"unapplied edits kept in {rejected}"
+            )
+            ops = []
+
+        for op in ops:
+            try:
+                apply_operation(config, op)
+            except (LookupError, ValueError) as e:
+                print(f"Skipping journal entry for {self.config_file.name}: {e}")
+                continue
+            self.pending.append(op)
+
+        self._reset_journal()
+        for op in self.pending:
+            self._append(op)
+        if self.pending:
+            self._schedule_compaction()
+
+    def _reset_journal(self):
+        header = json.dumps({"base": self._file_hash}) + "\n"
+        atomic_write(self.journal_file, header.encode("utf-8"))
+
+    def _append(self, entry: Dict[str, Any]):
+        with open(self.journal_file, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    @property
+    def stale(self) -> bool:
+        """Whether the YAML file changed outside navspec since it was read."""
+        return file_stat(self.config_file) != self._file_stat
+
+    def snapshot(self) -> DashboardConfig:
+        """Return a copy of the current in-memory configuration.
+
+        If the YAML file was edited outside navspec, it is reloaded and
+        pending journal entries are set aside.
+        """
+        with self.lock:
+            if self.stale:
+                self._recover()
+            return DashboardConfig.from_dict(self.config.to_dict())
+
+    def apply(self, op: Dict[str, Any]) -> None:
+        """Apply an operation to the in-memory model and journal it."""
+        with self.lock:
+            if self.stale:
+                self._recover()
+
+            apply_operation(self.config, op)
+            try:
+                self._append(op)
+            except OSError as e:
+                # Keep the in-memory model in step with what is on disk
+                self._recover()
+                raise JournalError(f"Failed to journal edit: {e}") from e
+
+            self.pending.append(op)
+            self._schedule_compaction()
+
+    def _schedule_compaction(self):
+        if self._timer is None:
+            self._timer = threading.Timer(self.compact_delay, self.compact)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def compact(self):
+        """Fold pending journal entries into the YAML file atomically."""
+        with self.lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self.pending:
+                return
+
+            content = yaml.dump(
+                self.config.to_dict(), default_flow_style=False, indent=2
+            ).encode("utf-8")
+            new_hash = hashlib.sha256(content).hexdigest()
+
+            self._append({"op": "compact", "hash": new_hash})
+            self._write(content)
+
+        if self.on_compact:
+            self.on_compact(self)
+
+    def replace(self, config: DashboardConfig):
+        """Replace the whole configuration, discarding pending edits."""
+        with self.lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            content = yaml.dump(
+                config.to_dict(), default_flow_style=False, indent=2
+            ).encode("utf-8")
+            self._write(content)
+            self.config = DashboardConfig.from_dict(config.to_dict())
+
+    def _write(self, content: bytes):
+        atomic_write(self.config_file, content)
+        self._file_hash = hashlib.sha256(content).hexdigest()
+        self._file_stat = file_stat(self.config_file)
+        self.pending = []
+        self._reset_journal()
+
+    def close(self):
+        """Compact any pending edits and stop the compaction timer."""
+        self.compact()
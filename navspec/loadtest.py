@@ -0,0 +1,414 @@
+"""HTTP load testing for navspec dashboard servers.
+
+Drives a weighted mix of dashboard requests from many concurrent asyncio
+clients, each holding a keep-alive connection, and reports latency
+percentiles, a latency histogram, throughput and error rates. Runs can be
+saved as a baseline and later runs compared against it.
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import random
+import threading
+import time
+import urllib.parse
+from typing import Dict, List, Optional, Tuple
+
+# Default request mix: path -> relative weight. Read-only, so it is safe
+# to run against a live server
+DEFAULT_MIX = {
+    "/": 1,
+    "/api/config": 4,
+    "/api/configs": 2,
+    "/static/app.js": 1,
+    "/static/styles.css": 1,
+}
+
+# Requests added to the default mix when writes are enabled
+WRITE_MIX = {"/api/preferences": 1}
+
+# Endpoints that only accept POST; sent with an empty JSON body
+POST_PATHS = {"/api/preferences"}
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+HISTOGRAM_BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+REQUEST_TIMEOUT = 30.0
+
+# Absolute increase in error rate tolerated when comparing with a baseline
+ERROR_RATE_TOLERANCE = 0.001
+
+
+class LoadTestError(Exception):
+    """Raised when a load test cannot be run or compared."""
+
+
+def parse_mix(spec: Optional[str], writes: bool = False) -> Dict[str, int]:
+    """Parse a request mix such as ``/api/config=4,/=1``.
+
+    Paths that modify server state are only allowed with ``writes``.
+    """
+    if not spec:
+        return dict(DEFAULT_MIX, **WRITE_MIX) if writes else dict(DEFAULT_MIX)
+
+    mix = {}
+    for item in spec.split(","):
+        path, _, weight = item.strip().partition("=")
+        if not path.startswith("/"):
+            raise LoadTestError(f"Invalid path in request mix: {path}")
+        if not writes and urllib.parse.urlsplit(path).path in POST_PATHS:
+            raise LoadTestError(f"{path} modifies the server; enable writes to use it")
+        try:
+            mix[path] = int(weight) if weight else 1
+        except ValueError:
+            raise LoadTestError(f"Invalid weight in request mix: {item}")
+    return mix
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Return a percentile of already sorted samples."""
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, max(0, int(round(fraction * len(samples))) - 1))
+    return samples[index]
+
+
+class Stats:
+    """Latency samples and error counts for one endpoint or a whole run."""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.statuses: Dict[int, int] = {}
+
+    def record(self, latency_ms: float, status: Optional[int]):
+        self.latencies.append(latency_ms)
+        if status is None or status >= 400:
+            self.errors += 1
+        if status is not None:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def summary(self, elapsed: float) -> Dict:
+        samples = sorted(self.latencies)
+        count = len(samples)
+
+        histogram = {}
+        below = 0
+        for bound in HISTOGRAM_BUCKETS:
+            upto = bisect.bisect_right(samples, bound)
+            histogram[f"<={bound}ms"] = upto - below
+            below = upto
+        histogram[f">{HISTOGRAM_BUCKETS[-1]}ms"] = count - below
+
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "error_rate": self.errors / count if count else 0.0,
+            "throughput": count / elapsed if elapsed else 0.0,
+            "p50": percentile(samples, 0.50),
+            "p90": percentile(samples, 0.90),
+            "p99": percentile(samples, 0.99),
+            "max": samples[-1] if samples else 0.0,
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+            "histogram": histogram,
+        }
+
+
+class _Connection:
+    """A keep-alive HTTP/1.1 connection speaking just enough of the protocol."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def _streams(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        if self.reader is None or self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host, self.port
+            )
+        return self.reader, self.writer
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        self.reader = None
+
+    async def request(self, method: str, path: str) -> int:
+        reader, writer = await self._streams()
+
+        body = b"{}" if method == "POST" else b""
+        head = (
+            f"{method} {path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Connection: keep-alive\r\n"
+            "Accept-Encoding: identity\r\n"
+        )
+        if method == "POST":
+            head += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+        writer.write(head.encode("latin-1") + b"\r\n" + body)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by server")
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif "content-length" in headers:
+            await reader.readexactly(int(headers["content-length"]))
+        elif status not in (204, 304):
+            # No framing: the body runs until the server closes the connection
+            await reader.read()
+            self.close()
+
+        if headers.get("connection", "").lower() == "close" or status_line.startswith(
+            b"HTTP/1.0"
+        ):
+            self.close()
+        return status
+
+
+async def _client(
+    host: str,
+    port: int,
+    prefix: str,
+    paths: List[str],
+    weights: List[int],
+    deadline: float,
+    budget: List[float],
+    total: Stats,
+    per_path: Dict[str, Stats],
+):
+    connection = _Connection(host, port)
+    try:
+        while time.monotonic() < deadline:
+            if budget[0] <= 0:
+                break
+            budget[0] -= 1
+
+            path = random.choices(paths, weights)[0]
+            method = "POST" if urllib.parse.urlsplit(path).path in POST_PATHS else "GET"
+            started = time.perf_counter()
+            try:
+                status = await asyncio.wait_for(
+                    connection.request(method, prefix + path), REQUEST_TIMEOUT
+                )
+            except (
+                OSError,
+                EOFError,
+                ValueError,
+                IndexError,
+                asyncio.TimeoutError,
+            ) as e:
+                status = None
+                connection.close()
+                if isinstance(e, ConnectionRefusedError):
+                    await asyncio.sleep(0.1)
+            latency_ms = (time.perf_counter() - started) * 1000
+
+            total.record(latency_ms, status)
+            per_path[path].record(latency_ms, status)
+    finally:
+        connection.close()
+
+
+async def _run(
+    host: str,
+    port: int,
+    prefix: str,
+    mix: Dict[str, int],
+    concurrency: int,
+    duration: float,
+    max_requests: Optional[int],
+) -> Tuple[Stats, Dict[str, Stats], float]:
+    paths = list(mix)
+    weights = [mix[path] for path in paths]
+    total = Stats()
+    per_path = {path: Stats() for path in paths}
+    budget: List[float] = [max_requests if max_requests else float("inf")]
+
+    started = time.monotonic()
+    deadline = started + duration
+    await asyncio.gather(
+        *(
+            _client(
+                host, port, prefix, paths, weights, deadline, budget, total, per_path
+            )
+            for _ in range(concurrency)
+        )
+    )
+    return total, per_path, time.monotonic() - started
+
+
+def run_load_test(
+    url: str,
+    mix: Optional[Dict[str, int]] = None,
+    concurrency: int = 50,
+    duration: float = 10.0,
+    max_requests: Optional[int] = None,
+) -> Dict:
+    """Run a load test against a navspec server and return a report.
+
+    Request paths are relative to the URL's path, so a tenant such as
+    ``http://host/team-a`` can be targeted directly.
+    """
+    target = urllib.parse.urlsplit(url)
+    if target.scheme != "http" or not target.hostname:
+        raise LoadTestError(f"Only http:// targets are supported: {url}")
+
+    mix = mix or dict(DEFAULT_MIX)
+    total, per_path, elapsed = asyncio.run(
+        _run(
+            target.hostname,
+            target.port or 80,
+            target.path.rstrip("/"),
+            mix,
+            concurrency,
+            duration,
+            max_requests,
+        )
+    )
+
+    return {
+        "target": url,
+        "concurrency": concurrency,
+        "duration": elapsed,
+        "mix": mix,
+        "total": total.summary(elapsed),
+        "endpoints": {path: stats.summary(elapsed) for path, stats in per_path.items()},
+    }
+
+
+class InProcessServer:
+    """Runs a DashboardServer on an ephemeral port in a background thread."""
+
+    def __init__(self, config_path: str = ".", host: str = "127.0.0.1"):
+        from werkzeug.serving import make_server
+
+        from .server import DashboardServer
+
+        # Per-request access logs would dominate the test's own output
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+        self.dashboard = DashboardServer(config_path, port=0, host=host)
+        self.dashboard.config_manager.get_available_configs()
+        self.httpd = make_server(host, 0, self.dashboard.app, threaded=True)
+        self.url = f"http://{host}:{self.httpd.server_port}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self) -> "InProcessServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.dashboard.stop()
+
+
+def compare_reports(report: Dict, baseline: Dict, max_regression: float) -> List[str]:
+    """Compare a report with a baseline and return regressions beyond a ratio."""
+    regressions = []
+    current, previous = report["total"], baseline["total"]
+
+    for metric in ("p50", "p99"):
+        if previous[metric] and current[metric] > previous[metric] * (
+            1 + max_regression
+        ):
+            regressions.append(
+                f"{metric} {previous[metric]:.2f}ms -> {current[metric]:.2f}ms"
+            )
+
+    if previous["throughput"] and current["throughput"] < previous["throughput"] * (
+        1 - max_regression
+    ):
+        regressions.append(
+            f"throughput {previous['throughput']:.1f}/s -> "
+            f"{current['throughput']:.1f}/s"
+        )
+
+    if current["error_rate"] > previous["error_rate"] + ERROR_RATE_TOLERANCE:
+        regressions.append(
+            f"error rate {previous['error_rate']:.2%} -> {current['error_rate']:.2%}"
+        )
+
+    return regressions
+
+
+def format_report(report: Dict, baseline: Optional[Dict] = None) -> str:
+    """Format a load test report as a human-readable table."""
+    total = report["total"]
+    lines = [
+        f"Target:      {report['target']}",
+        f"Concurrency: {report['concurrency']}",
+        f"Duration:    {report['duration']:.1f}s",
+        f"Requests:    {total['requests']} ({total['throughput']:.1f}/s)",
+        f"Errors:      {total['errors']} ({total['error_rate']:.2%})",
+        "",
+        f"{'endpoint':<24}{'count':>8}{'errors':>8}{'p50':>10}{'p99':>10}{'max':>10}",
+    ]
+    for path, stats in report["endpoints"].items():
+        lines.append(
+            f"{path:<24}{stats['requests']:>8}{stats['errors']:>8}"
+            f"{stats['p50']:>9.2f}ms{stats['p99']:>8.2f}ms{stats['max']:>8.2f}ms"
+        )
+    lines.append(
+        f"{'all':<24}{total['requests']:>8}{total['errors']:>8}"
+        f"{total['p50']:>9.2f}ms{total['p99']:>8.2f}ms{total['max']:>8.2f}ms"
+    )
+
+    lines.extend(["", "Latency histogram:"])
+    peak = max(total["histogram"].values()) or 1
+    for bucket, count in total["histogram"].items():
+        bar = "#" * int(40 * count / peak)
+        lines.append(f"  {bucket:>9} {count:>8} {bar}")
+
+    if baseline is not None:
+        previous = baseline["total"]
+        lines.extend(["", "Compared with baseline:"])
+        for metric, unit in (("p50", "ms"), ("p99", "ms"), ("throughput", "/s")):
+            before, after = previous[metric], total[metric]
+            change = (after - before) / before if before else 0.0
+            lines.append(
+                f"  {metric:<11}{before:>10.2f}{unit} -> {after:>10.2f}{unit} "
+                f"({change:+.1%})"
+            )
+        lines.append(
+            f"  {'error rate':<11}{previous['error_rate']:>11.2%} -> "
+            f"{total['error_rate']:>11.2%}"
+        )
+
+    return "\n".join(lines)
+
+
+def load_report(path: str) -> Dict:
+    """Load a saved report, typically a baseline."""
+    try:
+        with open(path, "r") as f:
+            report: Dict = json.load(f)
+            return report
+    except (OSError, json.JSONDecodeError) as e:
+        raise LoadTestError(f"Could not read baseline {path}: {e}")
+
+
+def save_report(report: Dict, path: str):
+    """Save a report so later runs can be compared against it."""
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
@@ -0,0 +1,115 @@
+"""Compact search index for the dashboard's command palette.
+
+The browser matches keystrokes in a Web Worker against an index the server
+builds once per config version. Words are interned into a single sorted
+token table and each token's postings are delta-encoded link numbers, so
+even large dashboards ship as a small JSON document that the worker can
+search without touching the DOM.
+"""
+
+import json
+import re
+import urllib.parse
+from typing import Dict, List, Tuple
+
+from .types import DashboardConfig
+
+# Bump when the layout of the emitted index changes
+FORMAT_VERSION = 1
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# URL words that would match nearly every link
+_URL_NOISE = {"http", "https", "www", "com", "org", "net", "io"}
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric words."""
+    return _WORD_RE.findall(text.lower())
+
+
+def _url_tokens(url: str) -> List[str]:
+    parts = urllib.parse.urlsplit(url)
+    words = tokenize(f"{parts.netloc} {parts.path}")
+    return [word for word in words if word not in _URL_NOISE]
+
+
+class PaletteIndex:
+    """A serialized search index for one version of a configuration."""
+
+    def __init__(self, version: str, data: Dict):
+        self.version = version
+        self.data = data
+        self.body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def build_palette_index(config: DashboardConfig, version: str) -> PaletteIndex:
+    """Build the command palette index for a configuration.
+
+    The emitted document looks like::
+
+        {"format": 1, "version": "...", "categories": ["Ops", ...],
+         "tokens": ["grafana", "prod", ...],
+         "postings": [[0, 3, 1], ...],
+         "links": [[name, url, category, [tag tokens], status], ...]}
+
+    ``postings[i]`` lists the links containing ``tokens[i]``, as the first
+    link number followed by gaps to the next ones.
+    """
+    categories: List[str] = []
+    links: List[Tuple] = []
+    words: Dict[str, List[int]] = {}
+
+    for category in config.categories:
+        category_id = len(categories)
+        categories.append(category.name)
+        category_words = tokenize(category.name)
+
+        for link in category.links:
+            link_id = len(links)
+            tags = [tag.lower() for tag in link.tags or []]
+            links.append((link, category_id, tags))
+
+            link_words = set(category_words)
+            link_words.update(tokenize(link.name))
+            link_words.update(tokenize(link.description or ""))
+            link_words.update(_url_tokens(link.url))
+            for tag in tags:
+                link_words.add(tag)
+                link_words.update(tokenize(tag))
+
+            for word in link_words:
+                words.setdefault(word, []).append(link_id)
+
+    tokens = sorted(words)
+    token_ids = {token: i for i, token in enumerate(tokens)}
+
+    postings = []
+    for token in tokens:
+        previous = 0
+        deltas = []
+        for link_id in words[token]:
+            deltas.append(link_id - previous)
+            previous = link_id
+        postings.append(deltas)
+
+    return PaletteIndex(
+        version,
+        {
+            "format": FORMAT_VERSION,
+            "version": version,
+            "categories": categories,
+            "tokens": tokens,
+            "postings": postings,
+            "links": [
+                [
+                    link.name,
+                    link.url,
+                    category_id,
+                    sorted(token_ids[tag] for tag in set(tags)),
+                    link.status or "active",
+                ]
+                for link, category_id, tags in links
+            ],
+        },
+    )
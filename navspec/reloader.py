@@ -0,0 +1,160 @@
+"""Background configuration reloading for navspec.
+
+Request handlers never parse YAML. A single reloader thread parses changed
+files, builds a complete snapshot of every configuration and publishes it
+by swapping one reference, so readers always see a consistent set of
+last-good configs. Reload requests that arrive while a build is running
+are coalesced into the next build, and everyone waiting shares it.
+"""
+
+import threading
+import time
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, Mapping, Optional, Set
+
+from .facets import FacetIndex
+from .types import DashboardConfig
+
+# Seconds to wait for more file events before rebuilding, so an editor's
+# burst of writes results in one reload
+RELOAD_DEBOUNCE = 0.05
+
+# Seconds a caller waits for a synchronous reload
+RELOAD_TIMEOUT = 10.0
+
+
+class ConfigSnapshot:
+    """An immutable view of every configuration at one point in time.
+
+    Configs that failed to parse keep their last good version and record
+    the error. Each config's facet index is built for exactly the version
+    in the snapshot; handlers must treat all of these as read-only. Configs
+    parsed straight from a YAML file record that file's signature in
+    ``stats``, so others can tell whether the file still matches.
+    """
+
+    def __init__(
+        self,
+        configs: Dict[str, DashboardConfig],
+        versions: Dict[str, str],
+        errors: Dict[str, str],
+        generation: int,
+        facets: Optional[Dict[str, FacetIndex]] = None,
+        stats: Optional[Dict[str, tuple]] = None,
+    ):
+        self.configs: Mapping[str, DashboardConfig] = MappingProxyType(configs)
+        self.versions: Mapping[str, str] = MappingProxyType(versions)
+        self.errors: Mapping[str, str] = MappingProxyType(errors)
+        self.facets: Mapping[str, FacetIndex] = MappingProxyType(facets or {})
+        self.stats: Mapping[str, tuple] = MappingProxyType(stats or {})
+        self.generation = generation
+
+    @classmethod
+    def empty(cls) -> "ConfigSnapshot":
+        return cls({}, {}, {}, 0)
+
+
+SnapshotBuilder = Callable[[ConfigSnapshot, Optional[Set[str]]], ConfigSnapshot]
+
+
+class ConfigReloader:
+    """Single-flight builder that publishes config snapshots.
+
+    ``build(previous, names)`` returns a new snapshot from the previous
+    one, re-reading only ``names`` (or everything when None).
+    """
+
+    def __init__(self, build: SnapshotBuilder):
+        self.build = build
+        self.snapshot = ConfigSnapshot.empty()
+
+        self._cond = threading.Condition()
+        self._dirty: Set[str] = set()
+        self._full = False
+        self._due: Optional[float] = None
+        self._requested = 0
+        self._completed = 0
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the reloader thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="navspec-reloader", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop the reloader thread once any running build finishes."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def request(self, names: Optional[Iterable[str]] = None, delay: float = 0.0) -> int:
+        """Ask for a reload of some configs, or all of them, without waiting.
+
+        Returns a ticket that ``wait`` accepts. Requests made before the
+        reloader picks them up share one build.
+        """
+        with self._cond:
+            if names is None:
+                self._full = True
+            else:
+                self._dirty.update(names)
+
+            due = time.monotonic() + delay
+            self._due = due if self._due is None else min(self._due, due)
+            self._requested += 1
+            self._cond.notify_all()
+            return self._requested
+
+    def wait(self, ticket: int, timeout: float = RELOAD_TIMEOUT) -> bool:
+        """Wait until the build covering a request has been published."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self._completed >= ticket or self._stopped, timeout
+            )
+
+    def reload(
+        self, names: Optional[Iterable[str]] = None, timeout: float = RELOAD_TIMEOUT
+    ) -> ConfigSnapshot:
+        """Reload configs and return the snapshot that includes them."""
+        self.wait(self.request(names), timeout)
+        return self.snapshot
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    if self._requested > self._completed:
+                        remaining = self._due - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    else:
+                        self._cond.wait()
+                if self._stopped:
+                    return
+
+                target = self._requested
+                names = None if self._full else self._dirty
+                self._dirty = set()
+                self._full = False
+                self._due = None
+
+            try:
+                snapshot = self.build(self.snapshot, names)
+            except Exception as e:
+                # Keep serving the last good snapshot
+                print(f"Error reloading configurations: {e}")
+                snapshot = self.snapshot
+
+            with self._cond:
+                # Readers pick up the new snapshot with a single reference read
+                self.snapshot = snapshot
+                self._completed = target
+                self._cond.notify_all()
@@ -0,0 +1,278 @@
+"""Persisted link search index for fast terminal lookups.
+
+``navspec query`` and ``navspec open`` read a precompiled index from
+``.navspec/search-index`` instead of parsing YAML. The index records the
+hash of every config file it was built from and is rebuilt only when one of
+them changes. This module deliberately avoids importing PyYAML (or anything
+else heavy) at import time so the fast path stays fast.
+"""
+
+import bisect
+import hashlib
+import marshal
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+INDEX_FILE = "search-index"
+
+# Bump when the on-disk layout of entries changes
+FORMAT_VERSION = 2
+
+# Entry fields, stored as tuples for compact marshalling
+NAME, URL, DESCRIPTION, CATEGORY, CONFIG, TAGS, STATUS, NAME_LC, HAYSTACK = range(9)
+
+Entry = Tuple
+
+
+def resolve_paths(project_path: str = ".") -> Tuple[Path, Path]:
+    """Return the (config directory, .navspec directory) of a project.
+
+    Configs live in a ``config/`` subdirectory when there is one; the
+    ``.navspec`` directory is always in the project root.
+    """
+    root = Path(project_path).resolve()
+    config_dir = root / "config" if (root / "config").exists() else root
+    return config_dir, root / ".navspec"
+
+
+def config_files(project_path: str = ".") -> List[Path]:
+    """List local and remotely mirrored config files, local ones first."""
+    config_dir, user_dir = resolve_paths(project_path)
+    files = sorted(config_dir.glob("*.yaml"))
+    local = {path.name for path in files}
+    remote_dir = user_dir / "remote"
+    if remote_dir.exists():
+        files.extend(
+            path for path in sorted(remote_dir.glob("*.yaml")) if path.name not in local
+        )
+    return files
+
+
+def _file_hash(path: Path) -> str:
+    return hashlib.sha1(path.read_bytes()).hexdigest()
+
+
+def _is_subsequence(term: str, text: str) -> bool:
+    it = iter(text)
+    return all(char in it for char in term)
+
+
+def _score_term(term: str, entry: Entry) -> int:
+    """Score one query term against an entry; 0 means no match."""
+    name = entry[NAME_LC]
+    if name.startswith(term):
+        return 12
+    if (" " + term) in name or ("-" + term) in name:
+        return 10
+    if term in name:
+        return 6
+    if term in entry[TAGS]:
+        return 5
+    if term in entry[HAYSTACK]:
+        return 3
+    if _is_subsequence(term, name):
+        return 1
+    return 0
+
+
+class SearchIndex:
+    """Precompiled link entries with fuzzy matching."""
+
+    def __init__(
+        self,
+        entries: List[Entry],
+        files: Dict[str, Tuple],
+        blob: Optional[str] = None,
+        starts: Optional[List[int]] = None,
+    ):
+        self.entries = entries
+        # path -> (mtime_ns, size, sha1) of every file the index was built from
+        self.files = files
+        self.dirty = False
+
+        # All haystacks joined into one string, so substring candidates can
+        # be found with str.find instead of a Python loop over every entry
+        if blob is None or starts is None:
+            starts = []
+            offset = 0
+            for entry in entries:
+                starts.append(offset)
+                offset += len(entry[HAYSTACK]) + 1
+            blob = "\n".join(entry[HAYSTACK] for entry in entries)
+        self.blob = blob
+        self.starts = starts
+
+    def _candidates(self, term: str) -> List[int]:
+        """Positions of entries whose haystack contains a term."""
+        positions = []
+        find = self.blob.find
+        index = find(term)
+        while index != -1:
+            position = bisect.bisect_right(self.starts, index) - 1
+            positions.append(position)
+            if position + 1 < len(self.starts):
+                index = find(term, self.starts[position + 1])
+            else:
+                break
+        return positions
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[int, Entry]]:
+        """Return the best matching entries for a query, best first.
+
+        Every whitespace-separated term must match the link's name, tags,
+        category, URL or description; name matches rank highest and fall
+        back to subsequence matching, so ``grfna`` finds "Grafana".
+        """
+        terms = query.lower().split()
+        if not terms:
+            return []
+
+        # Score only entries containing the rarest term as a substring; fall
+        # back to a full fuzzy scan when that finds nothing
+        rarest = min(terms, key=self.blob.count)
+        results = self._score(terms, self._candidates(rarest))
+        if not results:
+            results = self._score(terms, range(len(self.entries)))
+
+        results.sort()
+        return [(-score, entry) for score, _, _, entry in results[:limit]]
+
+    def _score(self, terms: List[str], positions) -> List[Tuple]:
+        results = []
+        for position in positions:
+            entry = self.entries[position]
+            score = 0
+            for term in terms:
+                term_score = _score_term(term, entry)
+                if not term_score:
+                    break
+                score += term_score
+            else:
+                results.append((-score, len(entry[NAME]), position, entry))
+        return results
+
+    def is_current(self, paths: List[Path]) -> bool:
+        """Check whether the index still matches the given config files.
+
+        Unchanged stat information short-circuits hashing, so the common
+        case costs one stat call per file.
+        """
+        if sorted(str(path) for path in paths) != sorted(self.files):
+            return False
+
+        for path in paths:
+            mtime_ns, size, sha = self.files[str(path)]
+            try:
+                stat = path.stat()
+            except OSError:
+                return False
+            if (stat.st_mtime_ns, stat.st_size) == (mtime_ns, size):
+                continue
+            if _file_hash(path) != sha:
+                return False
+            # Touched but unchanged: remember the new stat for next time
+            self.files[str(path)] = (stat.st_mtime_ns, stat.st_size, sha)
+            self.dirty = True
+        return True
+
+    def save(self, path: Path):
+        """Write the index atomically."""
+        data = marshal.dumps(
+            (
+                FORMAT_VERSION,
+                sys.version_info[:2],
+                self.files,
+                self.entries,
+                self.blob,
+                self.starts,
+            )
+        )
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["SearchIndex"]:
+        """Read an index, or return None if it is missing or incompatible."""
+        try:
+            with open(path, "rb") as f:
+                data = marshal.loads(f.read())
+            version, python, files, entries, blob, starts = data
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if version != FORMAT_VERSION or tuple(python) != sys.version_info[:2]:
+            return None
+        return cls(entries, files, blob, starts)
+
+
+def build_index(paths: List[Path]) -> SearchIndex:
+    """Parse config files and compile a fresh index. Imports PyYAML."""
+    import yaml
+
+    entries = []
+    files = {}
+    for path in paths:
+        content = path.read_bytes()
+        stat = path.stat()
+        files[str(path)] = (
+            stat.st_mtime_ns,
+            stat.st_size,
+            hashlib.sha1(content).hexdigest(),
+        )
+
+        try:
+            data = yaml.safe_load(content) or {}
+            categories = data.get("categories") or []
+        except (yaml.YAMLError, AttributeError) as e:
+            print(f"Skipping {path.name}: {e}", file=sys.stderr)
+            continue
+
+        for category in categories:
+            category_name = category.get("name", "")
+            for link in category.get("links") or []:
+                name = str(link.get("name", ""))
+                url = str(link.get("url", ""))
+                description = str(link.get("description") or "")
+                tags = tuple(str(tag).lower() for tag in link.get("tags") or [])
+                haystack = " ".join(
+                    [name, category_name, url, description, " ".join(tags)]
+                ).lower()
+                entries.append(
+                    (
+                        name,
+                        url,
+                        description,
+                        category_name,
+                        path.name,
+                        tags,
+                        link.get("status", "active"),
+                        name.lower(),
+                        haystack,
+                    )
+                )
+
+    return SearchIndex(entries, files)
+
+
+def load_index(project_path: str = ".", rebuild: bool = False) -> SearchIndex:
+    """Load the persisted index, rebuilding it only if a config changed."""
+    _, user_dir = resolve_paths(project_path)
+    index_path = user_dir / INDEX_FILE
+    paths = config_files(project_path)
+
+    index = None if rebuild else SearchIndex.load(index_path)
+    if index is not None and index.is_current(paths):
+        if not index.dirty:
+            return index
+    else:
+        index = build_index(paths)
+
+    try:
+        user_dir.mkdir(exist_ok=True)
+        index.save(index_path)
+    except OSError as e:
+        print(f"Could not save search index: {e}", file=sys.stderr)
+    return index
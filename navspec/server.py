@@ -2,21 +2,75 @@
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+from urllib.parse import urlencode
 
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, g, jsonify, request, send_from_directory
+from markupsafe import escape
+from werkzeug.serving import is_running_from_reloader, run_simple
 
+from .aggregate import DEFAULT_PAGE_SIZE
 from .config import ConfigManager
+from .history import config_version
+from .icons import DEFAULT_URL_TEMPLATE, IconManager
+from .journal import JournalError
+from .sources import DEFAULT_REFRESH_INTERVAL
+from .tenants import (
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_MEMORY_BUDGET,
+    TENANT_ENVIRON_KEY,
+    Tenant,
+    TenantDispatcher,
+    TenantRegistry,
+)
 from .types import DashboardConfig, UserPreferences
 
 
 class DashboardServer:
     """Flask server for serving the dashboard."""
 
+    # Endpoints served the same for every tenant
+    _GLOBAL_ENDPOINTS = {
+        "static",
+        "static_files",
+        "service_worker",
+        "health_check",
+        "tenant_stats",
+    }
+
     def __init__(
-        self, config_path: str = ".", port: int = 7777, host: str = "127.0.0.1"
+        self,
+        config_path: str = ".",
+        port: int = 7777,
+        host: str = "127.0.0.1",
+        sources: Optional[List[str]] = None,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        favicons: bool = False,
+        tenants_dir: Optional[str] = None,
+        tenant_routing: str = "path",
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        favicon_url: str = DEFAULT_URL_TEMPLATE,
     ):
-        self.config_manager = ConfigManager(config_path)
+        # In multi-tenant mode each subdirectory of tenants_dir is a config
+        # root with its own ConfigManager, loaded on first request
+        self.tenants = None
+        self._config_manager = None
+        if tenants_dir is not None:
+            if sources or favicons:
+                raise ValueError(
+                    "Remote sources and favicons are not supported with tenants"
+                )
+            self.tenants = TenantRegistry(tenants_dir, memory_budget, idle_timeout)
+        else:
+            self._config_manager = ConfigManager(config_path, sources, refresh_interval)
+
+        # Favicons are opt-in since fetching them contacts every link host
+        self.icons = None
+        if favicons:
+            self.icons = IconManager(
+                self.config_manager.user_config_dir / "icons", favicon_url
+            )
         self.port = port
         self.host = host
 
@@ -26,6 +80,28 @@ class DashboardServer:
         # Setup routes
         self._setup_routes()
 
+        if self.tenants is not None:
+            # Flask's documented way to wrap the app in WSGI middleware
+            self.app.wsgi_app = TenantDispatcher(  # type: ignore[method-assign]
+                self.app.wsgi_app, tenant_routing
+            )
+            self.app.before_request(self._select_tenant)
+            self.app.teardown_request(self._release_tenant)
+            self.tenants.start()
+
+    @property
+    def config_manager(self) -> ConfigManager:
+        """The config manager serving the current request."""
+        if self.tenants is None:
+            manager = self._config_manager
+        else:
+            tenant: Tenant = g.tenant
+            # Acquired tenants stay loaded until the request releases them
+            manager = tenant.config_manager
+        if manager is None:
+            raise RuntimeError("No config manager for this request")
+        return manager
+
     def _setup_routes(self):
         """Setup API routes and static file serving."""
 
@@ -34,15 +110,40 @@ class DashboardServer:
         def get_config():
             """Get dashboard configuration."""
             config_name = request.args.get("config_name")
-            config = self.config_manager.load_config(config_name)
+            since = request.args.get("since")
+            if since:
+                delta = self.config_manager.load_config_delta(since, config_name)
+                if delta is None:
+                    return jsonify({"error": "Configuration not found"}), 404
+                return jsonify(delta)
+
+            # Body and version must come from the same snapshot
+            config, version = self.config_manager.load_config_with_version(config_name)
             if config is None:
                 return jsonify({"error": "Configuration not found"}), 404
-            return jsonify(config.to_dict())
+            response = self._conditional_json(config.to_dict(), version)
+            response.headers["X-Navspec-Version"] = version or ""
+            return response
+
+        @self.app.route("/api/config/all")
+        def get_all_configs():
+            """Get one page of every config merged into a single dashboard."""
+            try:
+                offset = int(request.args.get("offset", 0))
+                limit = int(request.args.get("limit", DEFAULT_PAGE_SIZE))
+            except ValueError:
+                return jsonify({"error": "offset and limit must be integers"}), 400
+
+            aggregate = self.config_manager.get_aggregate()
+            page = aggregate.page(offset, limit)
+            etag = f"{page['metadata']['version']}-{page['offset']}-{page['limit']}"
+            return self._conditional_json(page, etag)
 
         @self.app.route("/api/user-config")
         def get_user_config():
             """Get user configuration and preferences."""
-            return jsonify(self.config_manager.get_user_config().to_dict())
+            data = self.config_manager.get_user_config().to_dict()
+            return self._conditional_json(data, config_version(data))
 
         @self.app.route("/api/preferences", methods=["POST"])
         def update_preferences():
@@ -54,6 +155,188 @@ class DashboardServer:
             except Exception as e:
                 return jsonify({"error": str(e)}), 400
 
+        # Fine-grained edits, journaled and compacted into the YAML file
+        @self.app.route("/api/configs/<config_name>/categories", methods=["POST"])
+        def add_category(config_name):
+            """Add a category."""
+            data = self._json_object()
+            if data is None:
+                return self._invalid_body()
+            return self._edit_config(
+                config_name,
+                {
+                    "op": "add_category",
+                    "category": data.get("category", {}),
+                    "position": data.get("position"),
+                },
+            )
+
+        @self.app.route(
+            "/api/configs/<config_name>/categories/<category>",
+            methods=["PATCH", "DELETE"],
+        )
+        def edit_category(config_name, category):
+            """Update or delete a category."""
+            if request.method == "DELETE":
+                op = {"op": "delete_category", "category": category}
+            else:
+                fields = self._json_object()
+                if fields is None:
+                    return self._invalid_body()
+                op = {"op": "update_category", "category": category, "fields": fields}
+            return self._edit_config(config_name, op)
+
+        @self.app.route(
+            "/api/configs/<config_name>/categories/<category>/move", methods=["POST"]
+        )
+        def move_category(config_name, category):
+            """Move a category to a new position."""
+            data = self._json_object()
+            if data is None:
+                return self._invalid_body()
+            return self._edit_config(
+                config_name,
+                {
+                    "op": "move_category",
+                    "category": category,
+                    "position": data.get("position"),
+                },
+            )
+
+        @self.app.route(
+            "/api/configs/<config_name>/categories/<category>/links", methods=["POST"]
+        )
+        def add_link(config_name, category):
+            """Add a link to a category."""
+            data = self._json_object()
+            if data is None:
+                return self._invalid_body()
+            return self._edit_config(
+                config_name,
+                {
+                    "op": "add_link",
+                    "category": category,
+                    "link": data.get("link", {}),
+                    "position": data.get("position"),
+                },
+            )
+
+        @self.app.route(
+            "/api/configs/<config_name>/categories/<category>/links/<link>",
+            methods=["PATCH", "DELETE"],
+        )
+        def edit_link(config_name, category, link):
+            """Update or delete a link."""
+            if request.method == "DELETE":
+                op = {"op": "delete_link", "category": category, "link": link}
+            else:
+                fields = self._json_object()
+                if fields is None:
+                    return self._invalid_body()
+                op = {
+                    "op": "update_link",
+                    "category": category,
+                    "link": link,
+                    "fields": fields,
+                }
+            return self._edit_config(config_name, op)
+
+        @self.app.route(
+            "/api/configs/<config_name>/categories/<category>/links/<link>/move",
+            methods=["POST"],
+        )
+        def move_link(config_name, category, link):
+            """Move a link within or between categories."""
+            data = self._json_object()
+            if data is None:
+                return self._invalid_body()
+            return self._edit_config(
+                config_name,
+                {
+                    "op": "move_link",
+                    "category": category,
+                    "link": link,
+                    "to_category": data.get("category"),
+                    "position": data.get("position"),
+                },
+            )
+
+        @self.app.route("/api/facets")
+        def get_facets():
+            """Get link counts per tag and status."""
+            config_name = request.args.get("config_name")
+            facets = self.config_manager.get_facets(config_name)
+            if facets is None:
+                return jsonify({"error": "Configuration not found"}), 404
+            return jsonify(facets.facet_counts())
+
+        @self.app.route("/api/facets/filter")
+        def filter_links():
+            """Get links matching a boolean tag and status expression."""
+            config_name = request.args.get("config_name")
+            query = request.args.get("q", "")
+            facets = self.config_manager.get_facets(config_name)
+            if facets is None:
+                return jsonify({"error": "Configuration not found"}), 404
+            try:
+                links = facets.filter(query)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            return jsonify({"query": query, "count": len(links), "links": links})
+
+        @self.app.route("/api/search-index")
+        def get_search_index():
+            """Get the command palette search index for a configuration."""
+            config_name = request.args.get("config_name")
+            index = self.config_manager.get_palette_index(config_name)
+            if index is None:
+                return jsonify({"error": "Configuration not found"}), 404
+
+            response = Response(index.body, mimetype="application/json")
+            response.set_etag(index.version)
+            response.headers["Cache-Control"] = "no-cache"
+            return response.make_conditional(request)
+
+        @self.app.route("/api/icons")
+        def get_icons():
+            """Get the favicon sprite sheet location and offsets."""
+            if self.icons is None:
+                return jsonify({"enabled": False})
+
+            config_name = self._sprite_config_name(request.args.get("config_name"))
+            sprite = self._get_sprite(config_name)
+            if sprite is None:
+                return jsonify({"error": "Configuration not found"}), 404
+
+            params = urlencode({"config_name": config_name, "v": sprite.key})
+            return jsonify(
+                {
+                    "enabled": True,
+                    "version": sprite.key,
+                    "stylesheet": f"/api/icons/sprite.css?{params}",
+                    "offsets": sprite.offsets,
+                }
+            )
+
+        @self.app.route("/api/icons/sprite.<kind>")
+        def get_icon_sprite(kind):
+            """Serve a config's favicon sprite sheet or its CSS offset map."""
+            if self.icons is None or kind not in ("svg", "css"):
+                return jsonify({"error": "Not found"}), 404
+
+            sprite = self._get_sprite(request.args.get("config_name"))
+            if sprite is None:
+                return jsonify({"error": "Configuration not found"}), 404
+
+            if kind == "svg":
+                response = Response(sprite.svg, mimetype="image/svg+xml")
+            else:
+                response = Response(sprite.css, mimetype="text/css")
+            response.set_etag(sprite.key)
+            if request.args.get("v") == sprite.key:
+                response.headers["Cache-Control"] = "public, max-age=31536000"
+            return response.make_conditional(request)
+
         @self.app.route("/api/configs")
         def get_available_configs():
             """Get list of available configuration files."""
@@ -76,6 +359,25 @@ class DashboardServer:
             """Health check endpoint."""
             return jsonify({"status": "healthy"})
 
+        @self.app.route("/_tenants")
+        def tenant_stats():
+            """Get per-tenant cache and memory statistics."""
+            if self.tenants is None:
+                return jsonify({"error": "Multi-tenant mode is not enabled"}), 404
+            return jsonify(self.tenants.stats())
+
+        # Service worker is served from the root so it controls the whole app
+        @self.app.route("/sw.js")
+        def service_worker():
+            """Serve the offline service worker."""
+            static_dir = os.path.join(os.path.dirname(__file__), "static")
+            response = send_from_directory(
+                static_dir, "sw.js", mimetype="application/javascript"
+            )
+            response.headers["Cache-Control"] = "no-cache"
+            response.headers["Service-Worker-Allowed"] = "/"
+            return response
+
         # Static files
         @self.app.route("/static/<path:filename>")
         def static_files(filename):
@@ -83,6 +385,66 @@ class DashboardServer:
             static_dir = os.path.join(os.path.dirname(__file__), "static")
             return send_from_directory(static_dir, filename)
 
+    def _select_tenant(self):
+        """Resolve the tenant of a request before it is handled."""
+        if request.endpoint in self._GLOBAL_ENDPOINTS:
+            return None
+
+        name = request.environ.get(TENANT_ENVIRON_KEY)
+        tenant = None
+        if name and self.tenants is not None:
+            tenant = self.tenants.acquire(name)
+        if tenant is None:
+            return jsonify({"error": "Unknown tenant"}), 404
+        g.tenant = tenant
+        return None
+
+    def _release_tenant(self, exc: Optional[BaseException]):
+        tenant = g.pop("tenant", None)
+        if tenant is not None and self.tenants is not None:
+            self.tenants.release(tenant)
+
+    def _sprite_config_name(self, config_name: Optional[str]) -> str:
+        """Resolve a missing or empty config name to the active config."""
+        return config_name or self.config_manager.user_preferences.active_config
+
+    def _get_sprite(self, config_name: Optional[str]):
+        """Get the favicon sprite sheet for a configuration."""
+        config_name = self._sprite_config_name(config_name)
+        config = self.config_manager.load_config(config_name)
+        if config is None or self.icons is None:
+            return None
+        return self.icons.sprite_for(config_name, config)
+
+    def _json_object(self) -> Optional[dict]:
+        """Get the request's JSON body, or None if it is not an object."""
+        data = request.get_json() or {}
+        return data if isinstance(data, dict) else None
+
+    def _invalid_body(self):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+
+    def _edit_config(self, config_name: str, op: dict):
+        """Apply a journaled edit and build the API response."""
+        try:
+            version = self.config_manager.edit_config(config_name, op)
+        except LookupError as e:
+            return jsonify({"error": str(e)}), 404
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        except JournalError as e:
+            return jsonify({"error": str(e)}), 500
+        return jsonify({"status": "success", "version": version})
+
+    def _conditional_json(self, data: dict, etag: Optional[str]):
+        """Build a JSON response that honours If-None-Match."""
+        response = jsonify(data)
+        if etag:
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = "no-cache"
+            response.make_conditional(request)
+        return response
+
     def _render_dashboard(self) -> str:
         """Render the dashboard HTML."""
         return """
@@ -94,7 +456,7 @@ class DashboardServer:
             <title>navspec Dashboard</title>
     <link rel="stylesheet" href="/static/styles.css">
 </head>
-<body>
+<body data-root="%s" data-favicons="%s">
     <div id="app">
         <header class="dashboard-header">
             <h1>navspec Dashboard</h1>
@@ -119,7 +481,10 @@ class DashboardServer:
     <script src="/static/app.js"></script>
 </body>
 </html>
-        """
+        """ % (
+            escape(request.script_root),
+            "on" if self.icons is not None else "off",
+        )
 
     def run(self, reload: bool = True):
         """Run the server."""
@@ -128,11 +493,62 @@ class DashboardServer:
 
     def stop(self):
         """Stop the server and cleanup."""
+        if self.tenants is not None:
+            self.tenants.close()
+            return
+
         self.config_manager.stop_file_watching()
+        self.config_manager.stop_remote_refresh()
+        self.config_manager.flush_journals()
+        self.config_manager.stop_reloading()
+        if self.icons is not None:
+            self.icons.shutdown()
+
+
+def is_serving_process(reload: bool) -> bool:
+    """Whether this process will serve requests.
+
+    With reloading on, werkzeug keeps a parent process that only restarts
+    a serving child when code changes. Journals, remote sources and config
+    watchers belong in the child alone.
+    """
+    return not reload or is_running_from_reloader()
+
+
+def _reloader_parent_app(environ, start_response):
+    start_response("503 Service Unavailable", [("Content-Type", "text/plain")])
+    return [b"navspec is restarting"]
+
+
+def run_reloader_parent(host: str, port: int):
+    """Run the reloader's parent process without creating a dashboard."""
+    run_simple(host, port, _reloader_parent_app, use_reloader=True)
 
 
 def create_server(
-    config_path: str = ".", port: int = 7777, host: str = "127.0.0.1"
+    config_path: str = ".",
+    port: int = 7777,
+    host: str = "127.0.0.1",
+    sources: Optional[List[str]] = None,
+    refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+    favicons: bool = False,
+    tenants_dir: Optional[str] = None,
+    tenant_routing: str = "path",
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    favicon_url: str = DEFAULT_URL_TEMPLATE,
 ) -> DashboardServer:
     """Create and return a dashboard server instance."""
-    return DashboardServer(config_path, port, host)
+    return DashboardServer(
+        config_path,
+        port,
+        host,
+        sources,
+        refresh_interval,
+        favicons,
+        tenants_dir,
+        tenant_routing,
+        memory_budget,
+        idle_timeout,
+        favicon_url,
+    )
@@ -0,0 +1,415 @@
+"""Remote configuration sources for navspec dashboard.
+
+A source mirrors YAML files from somewhere other than the local config
+directory (an HTTP URL, a tarball or a git repository) into a local
+directory that ConfigManager reads from. Fetches are conditional and only
+valid configurations replace the last good local copy, so loading a config
+never waits on the network.
+"""
+
+import hashlib
+import heapq
+import io
+import json
+import os
+import random
+import subprocess
+import tarfile
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from abc import ABC, abstractmethod
+from pathlib import Path, PurePosixPath
+from typing import Callable, Dict, List, Optional, Set
+
+import yaml
+
+from .types import DashboardConfig
+
+# Default refresh interval for remote sources, in seconds
+DEFAULT_REFRESH_INTERVAL = 300.0
+
+# Upper bound for the retry delay after repeated failures, in seconds
+MAX_BACKOFF = 3600.0
+
+# Fraction of the delay randomly added or removed to spread refreshes out
+JITTER = 0.1
+
+HTTP_TIMEOUT = 10
+
+# Records which source last published each mirrored file, so one source
+# never prunes a file another source provides under the same name
+OWNERS_FILE = ".owners.json"
+_owners_lock = threading.Lock()
+
+
+class SourceError(Exception):
+    """Raised when a remote source cannot be fetched."""
+
+
+class ConfigSource(ABC):
+    """Base class for remote configuration sources."""
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        self.source_id = hashlib.sha1(spec.encode("utf-8")).hexdigest()[:12]
+        self._cache_dir: Optional[Path] = None
+        self._mirror_dir: Optional[Path] = None
+
+    def attach(self, cache_root: Path, mirror_dir: Path):
+        """Attach the source to its on-disk cache and mirror directories."""
+        self._cache_dir = cache_root / self.source_id
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        self._mirror_dir = mirror_dir
+        self._mirror_dir.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def cache_dir(self) -> Path:
+        if self._cache_dir is None:
+            raise SourceError(f"{self.spec}: source is not attached")
+        return self._cache_dir
+
+    @property
+    def mirror_dir(self) -> Path:
+        if self._mirror_dir is None:
+            raise SourceError(f"{self.spec}: source is not attached")
+        return self._mirror_dir
+
+    @abstractmethod
+    def refresh(self) -> bool:
+        """Fetch the source and update the mirror. Returns True on change."""
+
+    def _load_meta(self) -> Dict:
+        meta_file = self.cache_dir / "meta.json"
+        if meta_file.exists():
+            try:
+                with open(meta_file, "r") as f:
+                    meta: Dict = json.load(f)
+                    return meta
+            except json.JSONDecodeError:
+                pass
+        return {}
+
+    def _save_meta(self, meta: Dict):
+        atomic_write(self.cache_dir / "meta.json", json.dumps(meta).encode("utf-8"))
+
+    def _conditional_get(self, url: str, meta: Dict) -> Optional[bytes]:
+        """GET a URL using cached validators. Returns None when unchanged."""
+        req = urllib.request.Request(url)
+        if meta.get("etag"):
+            req.add_header("If-None-Match", meta["etag"])
+        if meta.get("last_modified"):
+            req.add_header("If-Modified-Since", meta["last_modified"])
+
+        try:
+            with urllib.request.urlopen(req, timeout=HTTP_TIMEOUT) as response:
+                body: bytes = response.read()
+                meta["etag"] = response.headers.get("ETag")
+                meta["last_modified"] = response.headers.get("Last-Modified")
+                return body
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return None
+            raise SourceError(f"{url}: HTTP {e.code}") from e
+        except (urllib.error.URLError, OSError) as e:
+            raise SourceError(f"{url}: {e}") from e
+
+    def _publish(self, files: Dict[str, bytes], meta: Dict, prune: bool) -> bool:
+        """Write valid configs into the mirror, keeping last good copies.
+
+        With prune, files this source published before but no longer
+        provides are removed from the mirror, unless another source has
+        published a file of the same name since.
+        """
+        published = set(meta.get("files", []))
+        changed = False
+
+        with _owners_lock:
+            owners = self._load_owners()
+            for name, content in files.items():
+                if not _is_valid_config(content):
+                    print(f"Ignoring invalid config {name} from {self.spec}")
+                    continue
+
+                published.add(name)
+                owners[name] = self.source_id
+                target = self.mirror_dir / name
+                if target.exists() and target.read_bytes() == content:
+                    continue
+
+                atomic_write(target, content)
+                changed = True
+
+            if prune:
+                for name in published - set(files):
+                    if owners.get(name, self.source_id) == self.source_id:
+                        (self.mirror_dir / name).unlink(missing_ok=True)
+                        owners.pop(name, None)
+                        changed = True
+                published &= set(files)
+
+            atomic_write(
+                self.mirror_dir / OWNERS_FILE,
+                json.dumps(owners, sort_keys=True).encode("utf-8"),
+            )
+
+        meta["files"] = sorted(published)
+        return changed
+
+    def _load_owners(self) -> Dict[str, str]:
+        try:
+            with open(self.mirror_dir / OWNERS_FILE, "r") as f:
+                owners: Dict[str, str] = json.load(f)
+                return owners
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+
+class HTTPSource(ConfigSource):
+    """A single YAML file served over HTTP(S)."""
+
+    def __init__(self, url: str):
+        super().__init__(url)
+        self.url = url
+        self.filename = PurePosixPath(urllib.parse.urlparse(url).path).name
+        # The mirror only serves files the config listing picks up
+        if not self.filename.endswith(".yaml"):
+            raise ValueError(f"Remote config URL must end in .yaml: {url}")
+
+    def refresh(self) -> bool:
+        meta = self._load_meta()
+        body = self._conditional_get(self.url, meta)
+        if body is None:
+            return False
+
+        changed = self._publish({self.filename: body}, meta, prune=False)
+        self._save_meta(meta)
+        return changed
+
+
+class TarballSource(ConfigSource):
+    """A tarball of YAML files, served over HTTP(S) or read from disk."""
+
+    def __init__(self, location: str):
+        super().__init__(location)
+        self.location = location
+
+    def refresh(self) -> bool:
+        meta = self._load_meta()
+        if "://" in self.location:
+            body = self._conditional_get(self.location, meta)
+        else:
+            body = self._read_local(meta)
+        if body is None:
+            return False
+
+        try:
+            files = _extract_yaml(body)
+        except tarfile.TarError as e:
+            raise SourceError(f"{self.location}: {e}") from e
+
+        changed = self._publish(files, meta, prune=True)
+        self._save_meta(meta)
+        return changed
+
+    def _read_local(self, meta: Dict) -> Optional[bytes]:
+        path = Path(self.location)
+        try:
+            mtime = path.stat().st_mtime
+        except OSError as e:
+            raise SourceError(f"{self.location}: {e}") from e
+
+        if meta.get("mtime") == mtime:
+            return None
+        meta["mtime"] = mtime
+        return path.read_bytes()
+
+
+class GitSource(ConfigSource):
+    """YAML files from a git repository, fetched into a bare clone.
+
+    Specified as ``git+<url>[#<ref>]``. Files are read from the ``config/``
+    directory when the repository has one, otherwise from its root.
+    """
+
+    def __init__(self, spec: str):
+        super().__init__(spec)
+        location = spec[len("git+") :] if spec.startswith("git+") else spec
+        self.url, _, ref = location.partition("#")
+        self.ref = ref or "HEAD"
+
+    def refresh(self) -> bool:
+        meta = self._load_meta()
+        git_dir = self.cache_dir / "repo.git"
+        if not git_dir.exists():
+            self._git("init", "--bare", "--quiet", str(git_dir), git_dir=None)
+
+        self._git("fetch", "--quiet", "--depth", "1", self.url, self.ref)
+        revision = self._git("rev-parse", "FETCH_HEAD").strip()
+        if meta.get("revision") == revision:
+            return False
+
+        paths = self._git("ls-tree", "--name-only", revision, "config/").splitlines()
+        if not paths:
+            paths = self._git("ls-tree", "--name-only", revision).splitlines()
+
+        files = {}
+        for path in paths:
+            if path.endswith(".yaml"):
+                content = self._git("show", f"{revision}:{path}", text=False)
+                files[PurePosixPath(path).name] = content
+
+        changed = self._publish(files, meta, prune=True)
+        meta["revision"] = revision
+        self._save_meta(meta)
+        return changed
+
+    def _git(self, *args, git_dir="default", text=True):
+        command = ["git"]
+        if git_dir == "default":
+            command.append(f"--git-dir={self.cache_dir / 'repo.git'}")
+        command.extend(args)
+
+        try:
+            result = subprocess.run(
+                command, capture_output=True, check=True, text=text, timeout=60
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            raise SourceError(f"{self.url}: git {args[0]} failed: {e}") from e
+        return result.stdout
+
+
+def create_source(spec: str) -> ConfigSource:
+    """Create a config source from a URL or path specification."""
+    if spec.startswith("git+") or spec.endswith(".git"):
+        return GitSource(spec)
+    if spec.endswith((".tar", ".tar.gz", ".tgz")):
+        return TarballSource(spec)
+    if spec.startswith(("http://", "https://")):
+        return HTTPSource(spec)
+    raise ValueError(f"Unsupported config source: {spec}")
+
+
+class SourceScheduler:
+    """Refreshes config sources in a background thread.
+
+    Each source is refreshed every ``interval`` seconds with random jitter.
+    Failing sources back off exponentially up to MAX_BACKOFF.
+    """
+
+    def __init__(
+        self,
+        sources: List[ConfigSource],
+        interval: float = DEFAULT_REFRESH_INTERVAL,
+        on_change: Optional[Callable[[ConfigSource], None]] = None,
+    ):
+        self.sources = sources
+        self.interval = interval
+        self.on_change = on_change
+        self.failures: Dict[str, int] = {}
+        # Sources not yet tried once, successfully or not
+        self._pending: Set[str] = {source.source_id for source in sources}
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start refreshing, beginning with an immediate fetch of every source."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="navspec-sources", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background refresh thread."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def pending(self) -> bool:
+        """Whether some source has not finished its first refresh yet."""
+        return bool(self._pending)
+
+    def refresh(self, source: ConfigSource) -> float:
+        """Refresh one source and return the delay before its next refresh."""
+        try:
+            changed = source.refresh()
+        except Exception as e:
+            # Anything a source raises must not stop refreshing the others
+            failures = self.failures.get(source.source_id, 0) + 1
+            self.failures[source.source_id] = failures
+            print(f"Error refreshing config source {source.spec}: {e}")
+            return self._jitter(min(self.interval * 2**failures, MAX_BACKOFF))
+        finally:
+            self._pending.discard(source.source_id)
+
+        self.failures.pop(source.source_id, None)
+        if changed and self.on_change:
+            self.on_change(source)
+        return self._jitter(self.interval)
+
+    def _jitter(self, delay: float) -> float:
+        return delay * random.uniform(1 - JITTER, 1 + JITTER)
+
+    def _run(self):
+        queue = [(time.monotonic(), index) for index in range(len(self.sources))]
+        heapq.heapify(queue)
+
+        while queue and not self._stop.is_set():
+            due, index = queue[0]
+            if self._stop.wait(max(0.0, due - time.monotonic())):
+                break
+
+            heapq.heappop(queue)
+            delay = self.refresh(self.sources[index])
+            heapq.heappush(queue, (time.monotonic() + delay, index))
+
+
+def _is_valid_config(content: bytes) -> bool:
+    """Check that content parses into a DashboardConfig."""
+    try:
+        DashboardConfig.from_dict(yaml.safe_load(content))
+    except (yaml.YAMLError, KeyError, TypeError, AttributeError):
+        return False
+    return True
+
+
+def _extract_yaml(body: bytes) -> Dict[str, bytes]:
+    """Extract top-level and config/ YAML files from a tarball."""
+    files = {}
+    with tarfile.open(fileobj=io.BytesIO(body), mode="r:*") as archive:
+        for member in archive.getmembers():
+            path = PurePosixPath(member.name)
+            if not member.isfile() or path.suffix != ".yaml":
+                continue
+
+            # Accept a.yaml, config/a.yaml, <top>/a.yaml and <top>/config/a.yaml,
+            # since tarballs often wrap everything in a single directory
+            parts = [part for part in path.parts if part != "."]
+            if len(parts) > 3 or (len(parts) == 3 and parts[1] != "config"):
+                continue
+
+            content = archive.extractfile(member)
+            if content is not None:
+                files[path.name] = content.read()
+    return files
+
+
+def atomic_write(path: Path, content: bytes):
+    """Write a file atomically by renaming a temporary file over it."""
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -1,11 +1,53 @@
 // navspec Dashboard JavaScript
 
+// Pseudo config name selecting the merged view of every config
+const ALL_CONFIGS = '__all__';
+
+// Prefix of the API, set when serving one tenant of a multi-tenant server
+const API_ROOT = document.body.dataset.root || '';
+
+// Favicons are opt-in on the server; skip the icon API when they are off
+const FAVICONS_ENABLED = document.body.dataset.favicons === 'on';
+
+// The all-dashboards view is remembered per browser, never saved as the
+// server's active config, which must always name a real config
+const ALL_CONFIGS_KEY = `navspec:${API_ROOT || '/'}:all-configs`;
+
+function showingAllConfigs() {
+    try {
+        return localStorage.getItem(ALL_CONFIGS_KEY) === '1';
+    } catch (error) {
+        return false;
+    }
+}
+
+function setShowingAllConfigs(enabled) {
+    try {
+        if (enabled) {
+            localStorage.setItem(ALL_CONFIGS_KEY, '1');
+        } else {
+            localStorage.removeItem(ALL_CONFIGS_KEY);
+        }
+    } catch (error) {
+        // Storage may be unavailable; the choice then lasts for the page
+    }
+}
+
 class DashboardApp {
     constructor() {
         this.currentConfig = null;
+        this.currentConfigName = null;
+        this.currentVersion = null;
         this.userPreferences = null;
         this.availableConfigs = [];
 
+        // Command palette state; the worker is started on first use
+        this.searchWorker = null;
+        this.palette = null;
+        this.paletteRequest = 0;
+        this.paletteResults = [];
+        this.paletteSelection = 0;
+
         this.init();
     }
 
@@ -28,7 +70,7 @@ class DashboardApp {
 
     async loadUserConfig() {
         try {
-            const response = await fetch('/api/user-config');
+            const response = await fetch(`${API_ROOT}/api/user-config`);
             const userConfig = await response.json();
 
             this.userPreferences = userConfig.preferences;
@@ -47,31 +89,74 @@ class DashboardApp {
         if (!selector) return;
 
         selector.innerHTML = '';
+        const showAll = this.availableConfigs.length > 1 && showingAllConfigs();
 
         this.availableConfigs.forEach(configName => {
             const option = document.createElement('option');
             option.value = configName;
             option.textContent = configName.replace('.yaml', '');
 
-            if (configName === this.userPreferences.active_config) {
+            if (!showAll && configName === this.userPreferences.active_config) {
                 option.selected = true;
             }
 
             selector.appendChild(option);
         });
+
+        if (this.availableConfigs.length > 1) {
+            const option = document.createElement('option');
+            option.value = ALL_CONFIGS;
+            option.textContent = 'All dashboards';
+            option.selected = showAll;
+            selector.appendChild(option);
+        }
     }
 
     async loadDashboard(configName = null) {
+        const showAll = configName === null && this.availableConfigs.length > 1 &&
+            showingAllConfigs();
+        if (configName === ALL_CONFIGS || showAll) {
+            return this.loadAggregate();
+        }
+
         try {
-            const url = configName ? `/api/config?config_name=${configName}` : '/api/config';
-            const response = await fetch(url);
+            const params = new URLSearchParams();
+            if (configName) {
+                params.set('config_name', configName);
+            }
+
+            // Ask only for what changed when reloading the same config
+            const incremental = this.currentConfig && this.currentVersion &&
+                configName === this.currentConfigName;
+            if (incremental) {
+                params.set('since', this.currentVersion);
+            }
+
+            const query = params.toString();
+            const response = await fetch(query ? `${API_ROOT}/api/config?${query}` : `${API_ROOT}/api/config`);
 
             if (!response.ok) {
                 throw new Error(`HTTP ${response.status}: ${response.statusText}`);
             }
 
-            this.currentConfig = await response.json();
+            if (incremental) {
+                const delta = await response.json();
+                if (delta.type === 'patch') {
+                    this.applyPatch(delta.patch);
+                } else {
+                    this.currentConfig = delta.config;
+                }
+                this.currentVersion = delta.version;
+            } else {
+                this.currentConfig = await response.json();
+                this.currentVersion = response.headers.get('X-Navspec-Version');
+            }
+
+            this.currentConfigName = configName;
             this.renderDashboard();
+            if (FAVICONS_ENABLED) {
+                this.loadIcons(configName);
+            }
 
         } catch (error) {
             console.error('Failed to load dashboard:', error);
@@ -79,6 +164,121 @@ class DashboardApp {
         }
     }
 
+    async loadAggregate(offset = 0) {
+        try {
+            const response = await fetch(`${API_ROOT}/api/config/all?offset=${offset}`);
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+            }
+            const page = await response.json();
+
+            // Start over if any config changed since the previous page
+            if (offset > 0 && page.metadata.version !== this.currentVersion) {
+                return this.loadAggregate();
+            }
+
+            if (offset === 0) {
+                this.currentConfig = page;
+            } else {
+                this.appendCategories(page.categories);
+            }
+            this.currentConfigName = ALL_CONFIGS;
+            this.currentVersion = page.metadata.version;
+
+            const loaded = page.categories.reduce((sum, category) => sum + category.links.length, 0);
+            this.aggregateOffset = page.offset + loaded;
+            this.renderDashboard();
+
+            if (this.aggregateOffset < page.total) {
+                this.renderLoadMore(page.total);
+            }
+
+        } catch (error) {
+            console.error('Failed to load all dashboards:', error);
+            this.showError('Failed to load all dashboards');
+        }
+    }
+
+    appendCategories(categories) {
+        // A page boundary can split a category across two pages
+        const existing = this.currentConfig.categories;
+        categories.forEach(category => {
+            const last = existing[existing.length - 1];
+            if (last && last.name === category.name) {
+                last.links = last.links.concat(category.links);
+            } else {
+                existing.push(category);
+            }
+        });
+    }
+
+    renderLoadMore(total) {
+        const dashboardElement = document.getElementById('dashboard');
+        if (!dashboardElement) return;
+
+        const button = document.createElement('button');
+        button.className = 'load-more';
+        button.textContent = `Load more (${this.aggregateOffset} of ${total} links shown)`;
+        button.addEventListener('click', () => {
+            button.disabled = true;
+            this.loadAggregate(this.aggregateOffset);
+        });
+        dashboardElement.appendChild(button);
+    }
+
+    async loadIcons(configName = null) {
+        try {
+            const url = configName
+                ? `${API_ROOT}/api/icons?config_name=${encodeURIComponent(configName)}`
+                : `${API_ROOT}/api/icons`;
+            const response = await fetch(url);
+            if (!response.ok) return;
+
+            const icons = await response.json();
+            if (!icons.enabled) return;
+
+            // One stylesheet per config maps hosts to sprite sheet offsets
+            let stylesheet = document.getElementById('faviconSprite');
+            if (!stylesheet) {
+                stylesheet = document.createElement('link');
+                stylesheet.id = 'faviconSprite';
+                stylesheet.rel = 'stylesheet';
+                document.head.appendChild(stylesheet);
+            }
+            if (stylesheet.getAttribute('href') !== icons.stylesheet) {
+                stylesheet.setAttribute('href', icons.stylesheet);
+            }
+        } catch (error) {
+            console.error('Failed to load icons:', error);
+        }
+    }
+
+    applyPatch(patch) {
+        // Patch the current config in place, keyed by category and link name
+        if (patch.metadata) {
+            this.currentConfig.metadata = patch.metadata;
+        }
+
+        const categories = new Map(
+            this.currentConfig.categories.map(category => [category.name, category])
+        );
+        patch.categories.added.forEach(category => categories.set(category.name, category));
+
+        patch.categories.changed.forEach(change => {
+            const category = categories.get(change.name);
+            const links = new Map(category.links.map(link => [link.name, link]));
+            change.links.added.concat(change.links.changed).forEach(link => {
+                links.set(link.name, link);
+            });
+
+            category.description = change.description;
+            category.icon = change.icon;
+            category.links = change.links.order.map(name => links.get(name));
+        });
+
+        this.currentConfig.categories = patch.categories.order.map(name => categories.get(name));
+    }
+
     renderDashboard() {
         const dashboardElement = document.getElementById('dashboard');
         if (!dashboardElement || !this.currentConfig) return;
@@ -117,7 +317,7 @@ class DashboardApp {
                 <div class="category-header">
                     <h3>${this.escapeHtml(name)}</h3>
                     <div class="category-description">${this.escapeHtml(description)}</div>
-                    ${icon ? `<div class="category-icon">${icon}</div>` : ''}
+                    ${icon ? `<div class="category-icon">${this.escapeHtml(icon)}</div>` : ''}
                 </div>
                 <div class="links-grid">
                     ${this.renderLinks(links)}
@@ -143,7 +343,7 @@ class DashboardApp {
         return `
             <a href="${this.escapeHtml(url)}" class="link-card" target="_blank" rel="noopener noreferrer">
                 <div class="link-info">
-                    <div class="link-name">${this.escapeHtml(name)}</div>
+                    <div class="link-name">${this.renderFavicon(url)}${this.escapeHtml(name)}</div>
                     <div class="link-description">${this.escapeHtml(description)}</div>
                     <div class="link-url">${this.escapeHtml(url)}</div>
                     ${this.renderTags(tags)}
@@ -153,6 +353,16 @@ class DashboardApp {
         `;
     }
 
+    renderFavicon(url) {
+        // Drawn from the config's sprite sheet once its stylesheet loads
+        try {
+            const host = new URL(url).host.toLowerCase();
+            return `<span class="favicon" data-host="${this.escapeHtml(host)}"></span>`;
+        } catch (error) {
+            return '';
+        }
+    }
+
     renderTags(tags) {
         if (!tags || tags.length === 0) return '';
 
@@ -205,7 +415,7 @@ class DashboardApp {
 
     async saveUserPreferences() {
         try {
-            const response = await fetch('/api/preferences', {
+            const response = await fetch(`${API_ROOT}/api/preferences`, {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
@@ -243,12 +453,44 @@ class DashboardApp {
         document.addEventListener('keydown', (e) => {
             this.handleKeyboardShortcuts(e);
         });
+
+        // Offline caching
+        this.registerServiceWorker();
+    }
+
+    registerServiceWorker() {
+        if (!('serviceWorker' in navigator)) return;
+
+        // Re-render when a cached API response turns out to be stale
+        navigator.serviceWorker.addEventListener('message', (event) => {
+            if (!event.data || event.data.type !== 'navspec:updated') return;
+            this.handleCacheUpdate(new URL(event.data.url));
+        });
+
+        navigator.serviceWorker.register('/sw.js').catch(error => {
+            console.error('Failed to register service worker:', error);
+        });
+    }
+
+    async handleCacheUpdate(url) {
+        if (url.pathname === `${API_ROOT}/api/user-config`) {
+            await this.loadUserConfig();
+        } else if (url.pathname === `${API_ROOT}/api/config`) {
+            const configName = url.searchParams.get('config_name');
+            if (configName === this.currentConfigName) {
+                await this.loadDashboard(this.currentConfigName);
+            }
+        }
     }
 
     async handleConfigChange(configName) {
         try {
-            this.userPreferences.active_config = configName;
-            await this.saveUserPreferences();
+            // Keep the last real config active on the server
+            setShowingAllConfigs(configName === ALL_CONFIGS);
+            if (configName !== ALL_CONFIGS) {
+                this.userPreferences.active_config = configName;
+                await this.saveUserPreferences();
+            }
             await this.loadDashboard(configName);
         } catch (error) {
             console.error('Failed to change config:', error);
@@ -262,18 +504,172 @@ class DashboardApp {
     }
 
     handleKeyboardShortcuts(event) {
-        // Ctrl/Cmd + K for search (future feature)
+        // Ctrl/Cmd + K for the command palette
         if ((event.ctrlKey || event.metaKey) && event.key === 'k') {
             event.preventDefault();
-            // TODO: Implement search
-            console.log('Search shortcut pressed');
+            this.openCommandPalette();
         }
 
         // Ctrl/Cmd + R to refresh
         if ((event.ctrlKey || event.metaKey) && event.key === 'r') {
             event.preventDefault();
-            this.loadDashboard();
+            this.loadDashboard(this.currentConfigName);
+        }
+    }
+
+    getSearchWorker() {
+        if (!this.searchWorker) {
+            this.searchWorker = new Worker('/static/search-worker.js');
+            this.searchWorker.addEventListener('message', (event) => {
+                this.handleSearchMessage(event.data);
+            });
+        }
+        return this.searchWorker;
+    }
+
+    openCommandPalette() {
+        if (!this.palette) {
+            this.palette = this.createCommandPalette();
+        }
+
+        const { backdrop, input } = this.palette;
+        backdrop.hidden = false;
+        input.value = '';
+        input.focus();
+        this.renderPaletteResults([], 'Type to search links');
+
+        if (this.currentConfigName === ALL_CONFIGS) {
+            this.renderPaletteResults([], 'Search a single dashboard to use the palette');
+            return;
+        }
+
+        // Cheap when unchanged: the index is only rebuilt for a new version
+        const url = this.currentConfigName
+            ? `${API_ROOT}/api/search-index?config_name=${encodeURIComponent(this.currentConfigName)}`
+            : `${API_ROOT}/api/search-index`;
+        this.getSearchWorker().postMessage({ type: 'load', id: ++this.paletteRequest, url });
+    }
+
+    closeCommandPalette() {
+        if (this.palette) {
+            this.palette.backdrop.hidden = true;
+        }
+    }
+
+    createCommandPalette() {
+        const backdrop = document.createElement('div');
+        backdrop.className = 'command-palette-backdrop';
+        backdrop.hidden = true;
+        backdrop.innerHTML = `
+            <div class="command-palette" role="dialog" aria-label="Search links">
+                <input type="text" class="command-palette-input" placeholder="Search links..." autocomplete="off">
+                <ul class="command-palette-results" role="listbox"></ul>
+            </div>
+        `;
+        document.body.appendChild(backdrop);
+
+        const input = backdrop.querySelector('.command-palette-input');
+        const list = backdrop.querySelector('.command-palette-results');
+
+        input.addEventListener('input', () => {
+            this.getSearchWorker().postMessage({
+                type: 'query',
+                id: ++this.paletteRequest,
+                query: input.value,
+            });
+        });
+
+        input.addEventListener('keydown', (e) => {
+            if (e.key === 'Escape') {
+                this.closeCommandPalette();
+            } else if (e.key === 'ArrowDown' || e.key === 'ArrowUp') {
+                e.preventDefault();
+                const step = e.key === 'ArrowDown' ? 1 : -1;
+                const count = this.paletteResults.length;
+                if (count) {
+                    this.paletteSelection = (this.paletteSelection + step + count) % count;
+                    this.highlightPaletteSelection();
+                }
+            } else if (e.key === 'Enter') {
+                e.preventDefault();
+                this.openPaletteResult(this.paletteSelection);
+            }
+        });
+
+        list.addEventListener('click', (e) => {
+            const item = e.target.closest('li[data-index]');
+            if (item) {
+                this.openPaletteResult(Number(item.dataset.index));
+            }
+        });
+
+        backdrop.addEventListener('click', (e) => {
+            if (e.target === backdrop) {
+                this.closeCommandPalette();
+            }
+        });
+
+        return { backdrop, input, list };
+    }
+
+    handleSearchMessage(message) {
+        if (message.type === 'loaded') {
+            // Re-run anything typed while the index was still loading
+            if (this.palette.input.value) {
+                this.palette.input.dispatchEvent(new Event('input'));
+            }
+            return;
         }
+
+        // Drop answers to queries the user has already typed past
+        if (message.id !== this.paletteRequest) return;
+
+        if (message.type === 'results') {
+            const empty = this.palette.input.value ? 'No matching links' : 'Type to search links';
+            this.renderPaletteResults(message.results, empty);
+        } else if (message.type === 'error') {
+            console.error('Search failed:', message.message);
+            this.renderPaletteResults([], 'Search is unavailable');
+        }
+    }
+
+    renderPaletteResults(results, emptyMessage) {
+        this.paletteResults = results;
+        this.paletteSelection = 0;
+
+        const { list } = this.palette;
+        if (results.length === 0) {
+            list.innerHTML = `<li class="command-palette-empty">${this.escapeHtml(emptyMessage)}</li>`;
+            return;
+        }
+
+        list.innerHTML = results.map((result, i) => `
+            <li data-index="${i}" role="option">
+                <span class="command-palette-name">${this.escapeHtml(result.name)}</span>
+                <span class="command-palette-category">${this.escapeHtml(result.category)}</span>
+                <span class="command-palette-url">${this.escapeHtml(result.url)}</span>
+            </li>
+        `).join('');
+        this.highlightPaletteSelection();
+    }
+
+    highlightPaletteSelection() {
+        const items = this.palette.list.querySelectorAll('li[data-index]');
+        items.forEach((item, i) => {
+            const selected = i === this.paletteSelection;
+            item.classList.toggle('selected', selected);
+            item.setAttribute('aria-selected', String(selected));
+            if (selected) item.scrollIntoView({ block: 'nearest' });
+        });
+    }
+
+    openPaletteResult(position) {
+        const result = this.paletteResults[position];
+        if (!result) return;
+
+        this.addRecentLink(result.name);
+        window.open(result.url, '_blank', 'noopener,noreferrer');
+        this.closeCommandPalette();
     }
 
     showError(message) {
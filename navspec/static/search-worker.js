@@ -0,0 +1,155 @@
+// navspec command palette search worker
+//
+// Loads a config's search index from /api/search-index once and answers
+// fuzzy queries off the main thread, so typing stays responsive however
+// many links a dashboard has.
+
+const MAX_RESULTS = 20;
+const TERM_CACHE_SIZE = 256;
+
+let index = null;
+let loadedUrl = null;
+let termCache = new Map();
+
+self.addEventListener('message', async (event) => {
+    const message = event.data;
+    try {
+        if (message.type === 'load') {
+            await load(message.url);
+            self.postMessage({ type: 'loaded', id: message.id, version: index.version });
+        } else if (message.type === 'query') {
+            const results = index ? search(message.query) : [];
+            self.postMessage({ type: 'results', id: message.id, results });
+        }
+    } catch (error) {
+        self.postMessage({ type: 'error', id: message.id, message: String(error) });
+    }
+});
+
+async function load(url) {
+    // The server answers 304 while the version is unchanged, so reopening
+    // the palette only rebuilds the index after the config changed
+    const response = await fetch(url, { cache: 'no-cache' });
+    if (!response.ok) {
+        throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+    }
+
+    const data = await response.json();
+    if (index && loadedUrl === url && index.version === data.version) return;
+
+    // Postings arrive as gaps between link numbers; decode them once
+    const postings = data.postings.map(deltas => {
+        const ids = new Int32Array(deltas.length);
+        let previous = 0;
+        deltas.forEach((delta, i) => {
+            previous += delta;
+            ids[i] = previous;
+        });
+        return ids;
+    });
+
+    index = {
+        version: data.version,
+        tokens: data.tokens,
+        postings,
+        categories: data.categories,
+        links: data.links,
+        names: data.links.map(link => link[0].toLowerCase()),
+    };
+    loadedUrl = url;
+    termCache = new Map();
+}
+
+function lowerBound(tokens, term) {
+    let low = 0;
+    let high = tokens.length;
+    while (low < high) {
+        const mid = (low + high) >> 1;
+        if (tokens[mid] < term) {
+            low = mid + 1;
+        } else {
+            high = mid;
+        }
+    }
+    return low;
+}
+
+function isSubsequence(term, text) {
+    let position = 0;
+    for (let i = 0; i < text.length && position < term.length; i++) {
+        if (text[i] === term[position]) position++;
+    }
+    return position === term.length;
+}
+
+function matchTerm(term) {
+    // Best score per link for one query term, cached while the user types
+    const cached = termCache.get(term);
+    if (cached) return cached;
+
+    const scores = new Map();
+    const award = (tokenId, score) => {
+        index.postings[tokenId].forEach(linkId => {
+            if ((scores.get(linkId) || 0) < score) scores.set(linkId, score);
+        });
+    };
+
+    // Tokens are sorted, so prefix matches are one contiguous run
+    const { tokens } = index;
+    const start = lowerBound(tokens, term);
+    let end = start;
+    while (end < tokens.length && tokens[end].startsWith(term)) {
+        award(end, tokens[end] === term ? 4 : 3);
+        end++;
+    }
+
+    // Substring and subsequence matches scan the token table, which is far
+    // smaller than the set of links
+    tokens.forEach((token, tokenId) => {
+        if (tokenId >= start && tokenId < end) return;
+        if (token.includes(term)) {
+            award(tokenId, 2);
+        } else if (term.length > 1 && isSubsequence(term, token)) {
+            award(tokenId, 1);
+        }
+    });
+
+    if (termCache.size >= TERM_CACHE_SIZE) {
+        termCache.delete(termCache.keys().next().value);
+    }
+    termCache.set(term, scores);
+    return scores;
+}
+
+function search(query) {
+    const terms = query.toLowerCase().match(/[a-z0-9]+/g);
+    if (!terms) return [];
+
+    // Every term must match; start from the rarest to keep intersections small
+    const matches = terms.map(matchTerm).sort((a, b) => a.size - b.size);
+    const results = [];
+    matches[0].forEach((score, linkId) => {
+        let total = score;
+        for (let i = 1; i < matches.length; i++) {
+            const termScore = matches[i].get(linkId);
+            if (!termScore) return;
+            total += termScore;
+        }
+        if (index.names[linkId].startsWith(terms[0])) total += 2;
+        results.push([total, linkId]);
+    });
+
+    results.sort((a, b) => b[0] - a[0] || index.names[a[1]].length - index.names[b[1]].length);
+
+    return results.slice(0, MAX_RESULTS).map(([score, linkId]) => {
+        const [name, url, categoryId, tagIds, status] = index.links[linkId];
+        return {
+            name,
+            url,
+            category: index.categories[categoryId],
+            tags: tagIds.map(tagId => index.tokens[tagId]),
+            status,
+            score,
+        };
+    });
+}
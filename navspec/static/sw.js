@@ -0,0 +1,99 @@
+// navspec Service Worker
+//
+// Precaches the static app shell and serves it, together with dashboard
+// pages and the config API, stale-while-revalidate so the dashboard paints
+// instantly from cache and keeps working while navspec is restarting.
+
+const CACHE_NAME = 'navspec-v2';
+
+// Only files every server has; with multi-tenant path routing '/' is not a
+// dashboard, so pages are cached as they are visited instead
+const APP_SHELL = [
+    '/static/app.js',
+    '/static/styles.css',
+];
+
+// API endpoints cached stale-while-revalidate; other API calls hit the network
+const CACHED_API = [
+    '/api/config',
+    '/api/user-config',
+];
+
+self.addEventListener('install', (event) => {
+    event.waitUntil(
+        caches.open(CACHE_NAME)
+            .then(cache => cache.addAll(APP_SHELL))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', (event) => {
+    event.waitUntil(
+        caches.keys()
+            .then(names => Promise.all(
+                names.filter(name => name !== CACHE_NAME).map(name => caches.delete(name))
+            ))
+            .then(() => self.clients.claim())
+    );
+});
+
+self.addEventListener('fetch', (event) => {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin) return;
+
+    // Delta requests are already cheap and depend on the client's version
+    if (url.searchParams.has('since')) return;
+
+    // Tenants of a multi-tenant server serve the API under their own prefix
+    const cachedApi = CACHED_API.some(path => url.pathname.endsWith(path));
+    const page = request.mode === 'navigate';
+    if (APP_SHELL.includes(url.pathname) || page || cachedApi) {
+        event.respondWith(staleWhileRevalidate(event, request));
+    }
+});
+
+async function staleWhileRevalidate(event, request) {
+    const cache = await caches.open(CACHE_NAME);
+    const cached = await cache.match(request);
+
+    const revalidate = fetch(request)
+        .then(async (response) => {
+            if (response.ok) {
+                await cache.put(request, response.clone());
+                if (cached && isNewer(cached, response)) {
+                    await notifyClients(request.url);
+                }
+            }
+            return response;
+        })
+        .catch((error) => {
+            // The server may be restarting; the cached copy keeps us going
+            if (cached) return cached;
+            throw error;
+        });
+
+    if (cached) {
+        event.waitUntil(revalidate.catch(() => {}));
+        return cached;
+    }
+
+    return revalidate;
+}
+
+function isNewer(cached, response) {
+    // Prefer the server's config version, then its ETag
+    const header = response.headers.has('X-Navspec-Version') ? 'X-Navspec-Version' : 'ETag';
+    const previous = cached.headers.get(header);
+    const current = response.headers.get(header);
+    return Boolean(current) && current !== previous;
+}
+
+async function notifyClients(url) {
+    const clients = await self.clients.matchAll({ type: 'window' });
+    clients.forEach(client => {
+        client.postMessage({ type: 'navspec:updated', url });
+    });
+}
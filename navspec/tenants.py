@@ -0,0 +1,348 @@
+"""Multi-tenant hosting for navspec.
+
+One DashboardServer can serve many config roots ("tenants"), each a
+subdirectory of a tenants directory, under a path prefix (``/team-a/``) or
+a host prefix (``team-a.dash.example.com``). Tenants are loaded on first
+access and kept in an LRU bounded by an estimated memory budget, and the
+file watchers of idle tenants are shut down until they are used again.
+"""
+
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
+
+from .config import ConfigManager
+
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+DEFAULT_IDLE_TIMEOUT = 300.0
+ROUTING_MODES = ("path", "host")
+
+# WSGI environ key carrying the tenant name selected for a request
+TENANT_ENVIRON_KEY = "navspec.tenant"
+
+# First path segments served the same for every tenant in path routing
+GLOBAL_PATHS = {"static", "sw.js", "health", "_tenants"}
+
+_TENANT_NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+
+
+def deep_sizeof(obj, seen: Optional[set] = None) -> int:
+    """Approximate the memory held by nested containers and navspec objects.
+
+    Instances of navspec classes, such as configs and indexes, are walked
+    through their attributes; other objects are counted shallowly.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (dict, MappingProxyType)):
+        for key, value in obj.items():
+            size += deep_sizeof(key, seen) + deep_sizeof(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += deep_sizeof(item, seen)
+    elif type(obj).__module__.startswith("navspec.") and hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+class Tenant:
+    """One config root served under its own prefix."""
+
+    def __init__(self, name: str, root: Path):
+        self.name = name
+        self.root = root
+        self.config_manager: Optional[ConfigManager] = None
+        self.last_access = 0.0
+        self.active = 0
+        self.requests = 0
+        self.loads = 0
+        self.evictions = 0
+        self.memory = 0
+        self._memory_key: Optional[Tuple] = None
+        # Serializes loading, resuming and unloading this tenant, which
+        # happen outside the registry lock
+        self._loading = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self.config_manager is not None
+
+    @property
+    def watching(self) -> bool:
+        manager = self.config_manager
+        return manager is not None and manager.observer is not None
+
+    def measure_memory(self) -> Tuple[Optional[ConfigManager], Optional[Tuple], int]:
+        """Estimate memory use without storing it.
+
+        Returns the manager measured, the state the estimate is valid for
+        and the estimate. The walk is skipped if the state is unchanged
+        since the last stored estimate.
+        """
+        manager = self.config_manager
+        if manager is None:
+            return None, None, 0
+
+        key = (
+            manager.snapshot.generation,
+            tuple((n, h.latest, len(h)) for n, h in list(manager.history.items())),
+            tuple((n, i.version) for n, i in list(manager.palette_indexes.items())),
+            tuple(sorted(manager.aggregate.configs.items())),
+        )
+        if key == self._memory_key:
+            return manager, key, self.memory
+
+        # Parsed configs, facet indexes, version history, palette indexes
+        # and the merged view; objects they share are counted once
+        seen: set = set()
+        memory = deep_sizeof(manager.snapshot, seen)
+        for history in list(manager.history.values()):
+            for version in history:
+                memory += deep_sizeof(history.get(version), seen)
+        memory += deep_sizeof(dict(manager.palette_indexes), seen)
+        memory += deep_sizeof(manager.aggregate, seen)
+        return manager, key, memory
+
+    def store_memory(
+        self, manager: Optional[ConfigManager], key: Optional[Tuple], memory: int
+    ):
+        """Record an estimate from ``measure_memory`` if it is still current."""
+        if manager is self.config_manager:
+            self.memory = memory
+            self._memory_key = key
+
+    def stats(self) -> Dict:
+        manager = self.config_manager
+        return {
+            "loaded": self.loaded,
+            "watching": self.watching,
+            "requests": self.requests,
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "memory": self.memory,
+            "configs": sorted(manager.history) if manager else [],
+            "idle_seconds": (
+                round(time.monotonic() - self.last_access, 1)
+                if self.last_access
+                else None
+            ),
+        }
+
+
+class TenantRegistry:
+    """Lazily loaded tenants kept in an LRU under a memory budget."""
+
+    def __init__(
+        self,
+        tenants_dir: str,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ):
+        self.tenants_dir = Path(tenants_dir).resolve()
+        self.memory_budget = memory_budget
+        self.idle_timeout = idle_timeout
+        self.tenants: Dict[str, Tenant] = {}
+        # Loaded tenants, least recently used first
+        self._lru: "OrderedDict[str, Tenant]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start shutting down the watchers of idle tenants in the background."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="navspec-tenants", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        interval = max(1.0, self.idle_timeout / 2)
+        while not self._stop.wait(interval):
+            self.stop_idle_watchers()
+
+    def acquire(self, name: str) -> Optional[Tenant]:
+        """Get a tenant for a request, loading it if needed.
+
+        Returns None for names that are not tenant directories. Every
+        acquired tenant must be handed back with ``release``.
+        """
+        if not _TENANT_NAME_RE.match(name):
+            return None
+
+        with self._lock:
+            tenant = self.tenants.get(name)
+            if tenant is None:
+                root = self.tenants_dir / name
+                if not root.is_dir():
+                    return None
+                tenant = self.tenants[name] = Tenant(name, root)
+            # An active tenant is never evicted, so it stays loaded below
+            tenant.active += 1
+
+        # Loading parses every config, so only requests for this tenant wait
+        try:
+            with tenant._loading:
+                manager = tenant.config_manager
+                loaded = manager is None
+                if manager is None:
+                    tenant.config_manager = ConfigManager(str(tenant.root))
+                elif manager.observer is None:
+                    self._resume(manager)
+        except BaseException:
+            with self._lock:
+                tenant.active -= 1
+            raise
+
+        with self._lock:
+            if loaded:
+                tenant.loads += 1
+                self.misses += 1
+            else:
+                self.hits += 1
+            tenant.requests += 1
+            tenant.last_access = time.monotonic()
+            self._lru[name] = tenant
+            self._lru.move_to_end(name)
+        return tenant
+
+    def release(self, tenant: Tenant):
+        """Hand back a tenant after a request and enforce the memory budget."""
+        # Walking the tenant's data is slow, so it happens outside the lock
+        estimate = tenant.measure_memory()
+        with self._lock:
+            tenant.active -= 1
+            tenant.store_memory(*estimate)
+            victims = self._over_budget()
+        for victim in victims:
+            self._unload(victim)
+
+    def _over_budget(self) -> List[Tenant]:
+        total = sum(tenant.memory for tenant in self._lru.values())
+        victims = []
+        # Evict least recently used first, always keeping the most recent
+        for tenant in list(self._lru.values())[:-1]:
+            if total <= self.memory_budget:
+                break
+            if tenant.active:
+                continue
+            total -= tenant.memory
+            victims.append(tenant)
+        return victims
+
+    def _unload(self, tenant: Tenant, force: bool = False):
+        with tenant._loading:
+            with self._lock:
+                manager = tenant.config_manager
+                # A request may have picked the tenant up since it was chosen
+                if manager is None or (tenant.active and not force):
+                    return
+                tenant.config_manager = None
+                tenant.memory = 0
+                tenant._memory_key = None
+                tenant.evictions += 1
+                self._lru.pop(tenant.name, None)
+
+            # Still holding the tenant's guard, so a reload waits for the flush
+            manager.stop_file_watching()
+            manager.stop_remote_refresh()
+            manager.flush_journals()
+            manager.stop_reloading()
+
+    def _resume(self, manager: ConfigManager):
+        manager.start_file_watching()
+        # Catch up on changes made while nobody was watching
+        manager.reload(wait=False)
+
+    def stop_idle_watchers(self, now: Optional[float] = None) -> int:
+        """Stop watching files of tenants idle longer than the timeout."""
+        now = time.monotonic() if now is None else now
+
+        def idle(tenant: Tenant) -> bool:
+            return (
+                tenant.watching
+                and not tenant.active
+                and now - tenant.last_access > self.idle_timeout
+            )
+
+        with self._lock:
+            candidates = [tenant for tenant in self._lru.values() if idle(tenant)]
+
+        stopped = 0
+        for tenant in candidates:
+            with tenant._loading:
+                with self._lock:
+                    manager = tenant.config_manager
+                    if manager is None or not idle(tenant):
+                        continue
+                # Joining the observer thread can take a while
+                manager.stop_file_watching()
+                stopped += 1
+        return stopped
+
+    def stats(self) -> Dict:
+        """Cache and memory statistics for every tenant seen so far."""
+        with self._lock:
+            return {
+                "memory_budget": self.memory_budget,
+                "memory": sum(tenant.memory for tenant in self._lru.values()),
+                "loaded": len(self._lru),
+                "hits": self.hits,
+                "misses": self.misses,
+                "tenants": {
+                    name: tenant.stats()
+                    for name, tenant in sorted(self.tenants.items())
+                },
+            }
+
+    def close(self):
+        """Stop the idle watcher thread and unload every tenant."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            tenants = list(self._lru.values())
+        for tenant in tenants:
+            self._unload(tenant, force=True)
+
+
+class TenantDispatcher:
+    """WSGI middleware that picks the tenant for each request.
+
+    In path routing the first path segment names the tenant and is moved
+    into SCRIPT_NAME, so the app's routes stay unchanged. In host routing
+    the first label of the Host header names the tenant.
+    """
+
+    def __init__(self, app, routing: str = "path"):
+        if routing not in ROUTING_MODES:
+            raise ValueError(f"Unknown tenant routing mode: {routing}")
+        self.app = app
+        self.routing = routing
+
+    def __call__(self, environ, start_response):
+        if self.routing == "host":
+            host = environ.get("HTTP_HOST") or environ.get("SERVER_NAME", "")
+            environ[TENANT_ENVIRON_KEY] = host.split(":")[0].split(".")[0].lower()
+        else:
+            path = environ.get("PATH_INFO", "")
+            segment, _, rest = path.lstrip("/").partition("/")
+            if segment and segment not in GLOBAL_PATHS:
+                environ[TENANT_ENVIRON_KEY] = segment
+                environ["SCRIPT_NAME"] = environ.get("SCRIPT_NAME", "") + "/" + segment
+                environ["PATH_INFO"] = "/" + rest
+        return self.app(environ, start_response)
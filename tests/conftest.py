@@ -2,11 +2,16 @@
 Test configuration and shared fixtures for navspec tests.
 """
 
+import copy
 import shutil
 import tempfile
 from pathlib import Path
 
 import pytest
+import yaml
+
+from navspec.config import ConfigManager
+from navspec.types import Category, DashboardConfig, DashboardMetadata, Link
 
 
 @pytest.fixture
@@ -40,3 +45,50 @@ def sample_config():
             }
         ],
     }
+
+
+@pytest.fixture
+def valid_config(sample_config):
+    """Sample configuration with the tags DashboardConfig.from_dict requires."""
+    config = copy.deepcopy(sample_config)
+    config["metadata"]["tags"] = []
+    for link in config["categories"][0]["links"]:
+        link["tags"] = []
+    return config
+
+
+@pytest.fixture
+def write_config(temp_config_dir):
+    """Write config data as YAML, by default to default.yaml in the temp dir."""
+
+    def write(data, name="default.yaml", directory=None):
+        path = (directory or temp_config_dir) / name
+        with open(path, "w") as f:
+            yaml.dump(data, f)
+        return path
+
+    return write
+
+
+@pytest.fixture
+def make_config():
+    """Build a one-category DashboardConfig from Link argument tuples."""
+
+    def make(links, category="Ops"):
+        return DashboardConfig(
+            metadata=DashboardMetadata("Test", "", "1.0.0", []),
+            categories=[Category(category, "", [Link(*link) for link in links])],
+        )
+
+    return make
+
+
+@pytest.fixture
+def config_manager(temp_config_dir, valid_config, write_config):
+    """A ConfigManager serving valid_config as default.yaml."""
+    write_config(valid_config)
+    manager = ConfigManager(str(temp_config_dir))
+    yield manager
+    manager.stop_file_watching()
+    manager.flush_journals()
+    manager.stop_reloading()
@@ -0,0 +1,89 @@
+"""
+Tests for the aggregated all-dashboards view.
+"""
+
+import pytest
+
+from navspec.aggregate import AggregateView, normalize_url
+from navspec.config import ConfigManager
+
+
+def test_normalize_url():
+    assert normalize_url("HTTPS://Grafana.Example.com:443/") == (
+        "https://grafana.example.com"
+    )
+    assert normalize_url("http://example.com:8080/a/#top") == (
+        "http://example.com:8080/a"
+    )
+
+
+def test_deduplicates_and_merges_tags(make_config):
+    view = AggregateView()
+    view.update(
+        "a.yaml",
+        "1",
+        make_config([("Grafana", "https://grafana.example.com/", "", ["prod"])]),
+    )
+    view.update(
+        "b.yaml",
+        "1",
+        make_config(
+            [
+                ("grafana", "https://GRAFANA.example.com", "", ["metrics"]),
+                ("Kibana", "https://kibana.example.com", "", []),
+            ],
+            "Monitoring",
+        ),
+    )
+
+    page = view.page()
+    assert page["total"] == 2
+    grafana = page["categories"][1]["links"][0]
+    assert grafana["name"] == "Grafana"
+    assert grafana["tags"] == ["prod", "metrics"]
+    assert grafana["configs"] == ["a.yaml", "b.yaml"]
+
+    # Unchanged versions are skipped; changes only touch affected links
+    assert view.update("b.yaml", "1", make_config([], "Monitoring")) == 0
+    assert view.update("b.yaml", "2", make_config([], "Monitoring")) == 2
+    assert view.page()["categories"][0]["links"][0]["tags"] == ["prod"]
+
+    view.remove("a.yaml")
+    assert view.page()["total"] == 0
+
+
+def test_pagination(make_config):
+    view = AggregateView()
+    links = [(f"link-{i:02}", f"https://example.com/{i}", "", []) for i in range(10)]
+    view.update("a.yaml", "1", make_config(links))
+
+    page = view.page(offset=8, limit=4)
+    assert page["total"] == 10
+    assert [link["name"] for link in page["categories"][0]["links"]] == [
+        "link-08",
+        "link-09",
+    ]
+
+
+def test_config_manager_aggregate(temp_config_dir, valid_config, write_config):
+    for name in ("default.yaml", "team.yaml"):
+        write_config(valid_config, name)
+
+    manager = ConfigManager(str(temp_config_dir))
+    try:
+        view = manager.get_aggregate()
+        assert sorted(view.configs) == ["default.yaml", "team.yaml"]
+        assert view.page()["total"] == 1
+
+        # The aggregate view is client-side and never the active config
+        with pytest.raises(ValueError):
+            manager.update_user_preferences(active_config="__all__")
+        manager.update_user_preferences(active_config="team.yaml")
+        assert manager.user_preferences.active_config == "team.yaml"
+
+        (temp_config_dir / "team.yaml").unlink()
+        manager.reload()
+        assert list(manager.get_aggregate().configs) == ["default.yaml"]
+    finally:
+        manager.stop_file_watching()
+        manager.stop_reloading()
@@ -0,0 +1,90 @@
+"""
+Tests for the tag and status facet index.
+"""
+
+import pytest
+
+from navspec.facets import FacetIndex
+from navspec.server import DashboardServer
+
+
+def _link(name, tags, status):
+    return (name, f"https://{name}", "", tags, status)
+
+
+LINKS = [
+    _link("grafana-prod", ["production", "grafana"], "active"),
+    _link("grafana-staging", ["staging", "grafana"], "active"),
+    _link("kibana-prod", ["production", "kibana"], "down"),
+    _link("grafana-old", ["production", "grafana"], "down"),
+]
+
+
+def test_filter_expressions(make_config):
+    index = FacetIndex(make_config(LINKS))
+
+    def names(query):
+        return [link["name"] for link in index.filter(query)]
+
+    assert names("production AND grafana AND status != down") == ["grafana-prod"]
+    assert names("production grafana") == ["grafana-prod", "grafana-old"]
+    assert names("(staging OR kibana) AND NOT status:down") == ["grafana-staging"]
+    assert names("") == [link[0] for link in LINKS]
+
+    with pytest.raises(ValueError):
+        index.evaluate("(production")
+
+
+def test_incremental_update_reuses_slots(make_config):
+    index = FacetIndex(make_config(LINKS))
+    assert index.facet_counts()["tags"]["grafana"] == 3
+
+    updated = [link for link in LINKS if link[0] != "grafana-old"]
+    updated[2] = _link("kibana-prod", ["production", "kibana"], "active")
+    assert index.update(make_config(updated)) == 2
+
+    counts = index.facet_counts()
+    assert counts["total"] == 3
+    assert counts["tags"]["grafana"] == 2
+    assert counts["status"] == {"active": 3}
+
+    index.update(make_config(updated + [_link("loki", ["logs"], "active")]))
+    assert len(index.slots) == 4
+    assert max(index.slots.values()) == 3
+
+
+def test_duplicate_names_and_operator_tags(make_config):
+    index = FacetIndex(
+        make_config(
+            [
+                _link("grafana", ["and"], "active"),
+                _link("grafana", ["not"], "down"),
+                _link("loki", ["or"], "active"),
+            ]
+        )
+    )
+    assert index.facet_counts()["total"] == 3
+    assert [link["url"] for link in index.filter("status:down")] == ["https://grafana"]
+    assert len(index.filter("tag:and OR tag:not")) == 2
+    assert [link["name"] for link in index.filter("tag:or")] == ["loki"]
+    assert len(index.filter("NOT tag:not")) == 2
+
+
+def test_deeply_nested_filter_is_rejected(temp_config_dir):
+    index = FacetIndex()
+    assert index.evaluate("(" * 10 + "production" + ")" * 10) == 0
+    with pytest.raises(ValueError):
+        index.evaluate("(" * 2000)
+    with pytest.raises(ValueError):
+        index.evaluate("NOT " * 2000 + "production")
+
+    server = DashboardServer(str(temp_config_dir))
+    try:
+        server.config_manager.get_available_configs()
+        response = server.app.test_client().get(
+            "/api/facets/filter",
+            query_string={"config_name": "default.yaml", "q": "(" * 2000},
+        )
+        assert response.status_code == 400
+    finally:
+        server.stop()
@@ -0,0 +1,73 @@
+"""
+Tests for versioned config snapshots and delta responses.
+"""
+
+from navspec.history import ConfigHistory, apply_patch, diff_configs
+
+
+def test_history_ring_ages_out_old_versions(sample_config):
+    history = ConfigHistory(size=2)
+    first = history.record(sample_config)
+
+    for version in ("2.0.0", "3.0.0"):
+        sample_config = dict(sample_config)
+        sample_config["metadata"] = dict(sample_config["metadata"], version=version)
+        history.record(sample_config)
+
+    assert first not in history
+    assert len(history) == 2
+
+
+def test_diff_roundtrip(sample_config):
+    old = {
+        "metadata": sample_config["metadata"],
+        "categories": [
+            {
+                "name": "A",
+                "description": "",
+                "icon": None,
+                "links": [
+                    {"name": "one", "url": "https://one"},
+                    {"name": "two", "url": "https://two"},
+                ],
+            },
+            {"name": "B", "description": "", "icon": None, "links": []},
+        ],
+    }
+    new = {
+        "metadata": sample_config["metadata"],
+        "categories": [
+            {"name": "C", "description": "", "icon": None, "links": []},
+            {
+                "name": "A",
+                "description": "",
+                "icon": None,
+                "links": [
+                    {"name": "two", "url": "https://two.example"},
+                    {"name": "three", "url": "https://three"},
+                ],
+            },
+        ],
+    }
+
+    patch = diff_configs(old, new)
+    assert patch["categories"]["removed"] == ["B"]
+    assert patch["categories"]["changed"][0]["links"]["removed"] == ["one"]
+    assert apply_patch(old, patch) == new
+
+
+def test_delta_falls_back_to_full_document(config_manager, valid_config, write_config):
+    manager = config_manager
+    base = manager.get_config_version("default.yaml")
+
+    valid_config["categories"][0]["links"][0]["url"] = "https://changed.example"
+    write_config(valid_config)
+    manager.reload(["default.yaml"])
+
+    delta = manager.load_config_delta(base, "default.yaml")
+    assert delta["type"] == "patch"
+    assert delta["patch"]["categories"]["changed"][0]["links"]["changed"]
+
+    delta = manager.load_config_delta("unknown", "default.yaml")
+    assert delta["type"] == "full"
+    assert delta["version"] == manager.get_config_version("default.yaml")
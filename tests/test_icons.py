@@ -0,0 +1,142 @@
+"""
+Tests for favicon fetching, caching and sprite sheets.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from navspec.icons import IconManager, link_origins
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32
+
+
+class FaviconHandler(BaseHTTPRequestHandler):
+    """Local stand-in for link hosts: /<host>.ico serves a PNG for known hosts."""
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.path in ("/a.example.ico", "/b.example.ico"):
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(PNG)))
+            self.end_headers()
+            self.wfile.write(PNG)
+        elif self.path == "/truncated.example.ico":
+            # Sends part of a chunk, then closes the connection
+            self.protocol_version = "HTTP/1.1"
+            self.close_connection = True
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            self.wfile.write(b"%x\r\n" % (len(PNG) * 4) + PNG)
+        else:
+            self.send_response(404)
+            self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def favicon_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FaviconHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _links(hosts):
+    return [(host, f"https://{host}/path", "", []) for host in hosts]
+
+
+def test_sprite_rebuilt_only_when_hosts_change(
+    temp_config_dir, favicon_server, make_config
+):
+    port = favicon_server.server_address[1]
+    manager = IconManager(
+        temp_config_dir / "icons", url_template=f"http://127.0.0.1:{port}/{{host}}.ico"
+    )
+    try:
+        config = make_config(_links(["a.example", "b.example", "missing.example"]))
+        origins = {host: f"https://{host}" for host in ["a.example", "b.example"]}
+        origins["missing.example"] = "https://missing.example"
+        for future in manager.fetcher.fetch_missing(origins):
+            future.result()
+
+        sprite = manager.sprite_for("default.yaml", config)
+        assert sprite.offsets == {"a.example": [0, 0], "b.example": [16, 0]}
+        assert sprite.svg.count("<image") == 2
+        assert '.favicon[data-host="b.example"]' in sprite.css
+
+        # Both hosts share identical bytes, stored once
+        assert len(list((temp_config_dir / "icons" / "objects").iterdir())) == 1
+
+        # Same hosts: no refetch, same sheet object
+        assert manager.sprite_for("default.yaml", config) is sprite
+        assert len(favicon_server.requests) == 3
+
+        smaller = manager.sprite_for("default.yaml", make_config(_links(["a.example"])))
+        assert smaller is not sprite
+        assert smaller.offsets == {"a.example": [0, 0]}
+    finally:
+        manager.shutdown()
+
+
+def test_sprite_urls_resolve_active_config(
+    temp_config_dir, valid_config, write_config, favicon_server
+):
+    from navspec.server import DashboardServer
+
+    write_config(valid_config)
+
+    port = favicon_server.server_address[1]
+    server = DashboardServer(
+        str(temp_config_dir),
+        favicons=True,
+        favicon_url=f"http://127.0.0.1:{port}/{{host}}.ico",
+    )
+    try:
+        client = server.app.test_client()
+        active = server.config_manager.user_preferences.active_config
+
+        data = client.get("/api/icons?config_name=").get_json()
+        assert f"config_name={active}" in data["stylesheet"]
+        assert client.get(data["stylesheet"]).status_code == 200
+        assert client.get("/api/icons/sprite.css?config_name=&v=").status_code == 200
+        assert b'data-favicons="on"' in client.get("/").data
+    finally:
+        server.stop()
+
+
+def test_hosts_match_browser_url_host(make_config):
+    links = [
+        ("a", "https://a.example:443/x", "", []),
+        ("b", "http://b.example:80/", "", []),
+        ("c", "https://c.example:8443/", "", []),
+        ("d", "http://[::1]:8080/", "", []),
+    ]
+    assert link_origins(make_config(links)) == {
+        "a.example": "https://a.example",
+        "b.example": "http://b.example",
+        "c.example:8443": "https://c.example:8443",
+        "[::1]:8080": "http://[::1]:8080",
+    }
+
+
+def test_truncated_response_marks_host_missing(temp_config_dir, favicon_server):
+    port = favicon_server.server_address[1]
+    manager = IconManager(
+        temp_config_dir / "icons", url_template=f"http://127.0.0.1:{port}/{{host}}.ico"
+    )
+    try:
+        origins = {"truncated.example": "https://truncated.example"}
+        for future in manager.fetcher.fetch_missing(origins):
+            future.result()
+        assert manager.cache.lookup("truncated.example") is None
+        assert not manager.cache.needs_fetch("truncated.example")
+    finally:
+        manager.shutdown()
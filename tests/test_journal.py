@@ -0,0 +1,149 @@
+"""
+Tests for journaled link and category edits.
+"""
+
+import json
+
+import pytest
+import yaml
+
+from navspec.journal import ConfigJournal
+from navspec.server import DashboardServer
+
+
+@pytest.fixture
+def server(temp_config_dir):
+    server = DashboardServer(str(temp_config_dir))
+    server.config_manager.get_available_configs()
+    yield server
+    server.stop()
+
+
+def test_link_crud_endpoints(server, temp_config_dir):
+    client = server.app.test_client()
+    base = "/api/configs/default.yaml/categories"
+
+    response = client.post(base, json={"category": {"name": "Ops"}})
+    assert response.status_code == 200
+
+    response = client.post(
+        f"{base}/Ops/links",
+        json={"link": {"name": "Grafana", "url": "https://grafana.example"}},
+    )
+    assert response.status_code == 200
+
+    response = client.patch(f"{base}/Ops/links/Grafana", json={"status": "down"})
+    assert response.status_code == 200
+
+    response = client.post(
+        f"{base}/Ops/links/Grafana/move",
+        json={"category": "Development", "position": 0},
+    )
+    assert response.status_code == 200
+
+    assert client.delete(f"{base}/Missing").status_code == 404
+    assert client.patch(f"{base}/Ops", json={"bogus": 1}).status_code == 400
+    invalid = {"name": 42, "tags": "prod"}
+    assert (
+        client.patch(f"{base}/Development/links/Grafana", json=invalid).status_code
+        == 400
+    )
+    assert client.post(f"{base}/Ops/links", json=[1]).status_code == 400
+    move = client.post(f"{base}/Ops/move", json={"position": "first"})
+    assert move.status_code == 400
+
+    # Edits are visible immediately, before compaction
+    config = client.get("/api/config").get_json()
+    development = config["categories"][0]
+    assert development["links"][0]["name"] == "Grafana"
+    assert development["links"][0]["status"] == "down"
+    assert config["categories"][1] == {
+        "name": "Ops",
+        "description": "",
+        "icon": None,
+        "links": [],
+    }
+
+    server.config_manager.flush_journals()
+    with open(temp_config_dir / "default.yaml") as f:
+        data = yaml.safe_load(f)
+    assert data["categories"][0]["links"][0]["name"] == "Grafana"
+
+
+def test_journal_replays_after_crash(server, temp_config_dir):
+    config_file = temp_config_dir / "default.yaml"
+    journal_file = temp_config_dir / ".navspec" / "journal" / "default.yaml.jsonl"
+
+    journal = ConfigJournal(config_file, journal_file, compact_delay=3600)
+    journal.apply({"op": "add_category", "category": {"name": "Recovered"}})
+    journal._timer.cancel()
+
+    # A torn trailing line is ignored on replay
+    with open(journal_file, "a") as f:
+        f.write('{"op": "delete_cat')
+
+    recovered = ConfigJournal(config_file, journal_file, compact_delay=3600)
+    names = [category.name for category in recovered.config.categories]
+    assert names == ["Development", "Recovered"]
+
+    recovered.compact()
+    with open(journal_file) as f:
+        assert [json.loads(line) for line in f] == [{"base": recovered._file_hash}]
+
+
+def test_new_category_links_get_defaults(server):
+    client = server.app.test_client()
+    category = {
+        "name": "Ops",
+        "links": [{"name": "Grafana", "url": "https://grafana.example"}],
+    }
+    response = client.post(
+        "/api/configs/default.yaml/categories", json={"category": category}
+    )
+    assert response.status_code == 200
+
+    link = client.get("/api/config").get_json()["categories"][1]["links"][0]
+    assert link["description"] == ""
+    assert link["tags"] == []
+
+
+def test_journal_for_another_file_is_set_aside(server, temp_config_dir):
+    config_file = temp_config_dir / "default.yaml"
+    journal_file = temp_config_dir / ".navspec" / "journal" / "default.yaml.jsonl"
+
+    journal = ConfigJournal(config_file, journal_file, compact_delay=3600)
+    journal.apply({"op": "delete_category", "category": "Development"})
+    journal._timer.cancel()
+
+    # The file is rewritten before the journal is replayed
+    data = yaml.safe_load(config_file.read_text())
+    data["metadata"]["name"] = "Edited by hand"
+    config_file.write_text(yaml.dump(data))
+
+    recovered = ConfigJournal(config_file, journal_file, compact_delay=3600)
+    assert [category.name for category in recovered.config.categories] == [
+        "Development"
+    ]
+    assert not recovered.pending
+    rejected = journal_file.with_name(journal_file.name + ".rejected")
+    assert "delete_category" in rejected.read_text()
+
+
+def test_reloader_parent_leaves_journals_alone(temp_config_dir, monkeypatch):
+    from navspec import cli
+    from navspec import server as server_module
+
+    calls = []
+    monkeypatch.delenv("WERKZEUG_RUN_MAIN", raising=False)
+    monkeypatch.setattr(
+        server_module, "run_simple", lambda *args, **kwargs: calls.append(kwargs)
+    )
+    monkeypatch.setattr(
+        "sys.argv", ["navspec", "serve", "--no-browser", "-c", str(temp_config_dir)]
+    )
+
+    cli.main()
+
+    # Only the serving child creates a ConfigManager and replays journals
+    assert calls == [{"use_reloader": True}]
+    assert not (temp_config_dir / ".navspec").exists()
@@ -0,0 +1,77 @@
+"""
+Tests for the load testing harness.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from navspec.loadtest import (
+    InProcessServer,
+    LoadTestError,
+    compare_reports,
+    format_report,
+    parse_mix,
+    run_load_test,
+)
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    """Answers every request with an empty 200 and records its path."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.paths.append(self.path)
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_POST = do_GET
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_parse_mix():
+    assert parse_mix("/api/config=4,/") == {"/api/config": 4, "/": 1}
+    with pytest.raises(LoadTestError):
+        parse_mix("api/config=4")
+
+    # Writes must be asked for
+    assert "/api/preferences" not in parse_mix(None)
+    assert "/api/preferences" in parse_mix(None, writes=True)
+    with pytest.raises(LoadTestError):
+        parse_mix("/api/preferences=1")
+
+
+def test_requests_keep_the_url_path():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RecordingHandler)
+    server.paths = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/team-a/"
+        report = run_load_test(url, {"/api/config": 1}, concurrency=2, max_requests=4)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert report["total"]["errors"] == 0
+    assert server.paths == ["/team-a/api/config"] * 4
+
+
+def test_load_test_in_process(temp_config_dir):
+    with InProcessServer(str(temp_config_dir)) as server:
+        report = run_load_test(server.url, concurrency=4, max_requests=40)
+
+    total = report["total"]
+    assert total["requests"] == 40
+    assert total["errors"] == 0
+    assert sum(total["histogram"].values()) == 40
+    assert "Latency histogram" in format_report(report, report)
+
+    slower = dict(report, total=dict(total, p99=total["p99"] * 2 + 1))
+    assert compare_reports(slower, report, 0.1) == [
+        f"p99 {total['p99']:.2f}ms -> {slower['total']['p99']:.2f}ms"
+    ]
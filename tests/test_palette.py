@@ -0,0 +1,60 @@
+"""
+Tests for the command palette search index.
+"""
+
+import json
+
+from navspec.palette import build_palette_index
+from navspec.server import DashboardServer
+
+LINKS = [
+    ("Grafana Prod", "https://grafana.example.com/d/prod", "Metrics", ["production"]),
+    ("Kibana", "https://kibana.example.com", "Logs", []),
+]
+
+
+def _decode(postings):
+    ids, previous = [], 0
+    for delta in postings:
+        previous += delta
+        ids.append(previous)
+    return ids
+
+
+def test_index_interns_tokens_and_postings(make_config):
+    data = build_palette_index(make_config(LINKS, "Monitoring"), "v1").data
+    tokens = data["tokens"]
+
+    assert tokens == sorted(set(tokens))
+    assert "https" not in tokens
+
+    postings = dict(zip(tokens, data["postings"]))
+    assert _decode(postings["monitoring"]) == [0, 1]
+    assert _decode(postings["grafana"]) == [0]
+    assert _decode(postings["logs"]) == [1]
+
+    name, url, category, tags, status = data["links"][0]
+    assert (name, data["categories"][category]) == ("Grafana Prod", "Monitoring")
+    assert [tokens[tag] for tag in tags] == ["production"]
+
+
+def test_search_index_endpoint_is_cached(temp_config_dir):
+    server = DashboardServer(str(temp_config_dir))
+    try:
+        server.config_manager.get_available_configs()
+        client = server.app.test_client()
+
+        response = client.get("/api/search-index")
+        assert response.status_code == 200
+        assert json.loads(response.data)["format"] == 1
+        manager = server.config_manager
+        assert manager.get_palette_index() is manager.get_palette_index()
+
+        etag = response.headers["ETag"]
+        response = client.get("/api/search-index", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+        missing = client.get("/api/search-index?config_name=missing.yaml")
+        assert missing.status_code == 404
+    finally:
+        server.stop()
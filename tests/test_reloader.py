@@ -0,0 +1,134 @@
+"""
+Tests for background config reloading and snapshot publishing.
+"""
+
+import threading
+import time
+
+import yaml
+
+from navspec.reloader import ConfigReloader, ConfigSnapshot
+
+
+def test_requests_never_parse_yaml(config_manager, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("YAML parsed on the request path")
+
+    monkeypatch.setattr(yaml, "safe_load", fail)
+    assert config_manager.load_config("default.yaml").metadata.name == "Test Dashboard"
+    assert config_manager.get_config_version("default.yaml")
+
+
+def test_half_written_file_keeps_last_good(
+    config_manager, temp_config_dir, valid_config, write_config
+):
+    manager = config_manager
+    version = manager.get_config_version("default.yaml")
+
+    (temp_config_dir / "default.yaml").write_text("metadata:\n  name: [")
+    manager.reload(["default.yaml"])
+    assert "default.yaml" in manager.snapshot.errors
+    assert manager.load_config("default.yaml").metadata.name == "Test Dashboard"
+    assert manager.get_config_version("default.yaml") == version
+
+    # The watcher picks up the completed write
+    valid_config["metadata"]["name"] = "Renamed"
+    write_config(valid_config)
+    deadline = time.monotonic() + 5
+    while manager.get_config_version("default.yaml") == version:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert manager.load_config("default.yaml").metadata.name == "Renamed"
+    assert not manager.snapshot.errors
+
+
+def test_concurrent_reloads_are_coalesced():
+    builds = []
+
+    def build(previous, names):
+        builds.append(names)
+        time.sleep(0.05)
+        return ConfigSnapshot({}, {}, {}, previous.generation + 1)
+
+    reloader = ConfigReloader(build)
+    reloader.start()
+    try:
+        snapshots = []
+        threads = [
+            threading.Thread(target=lambda: snapshots.append(reloader.reload()))
+            for _ in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(snapshots) == 20
+        assert len(builds) <= 2
+        assert reloader.snapshot.generation == len(builds)
+    finally:
+        reloader.stop()
+
+
+def test_config_and_version_come_from_one_snapshot(config_manager):
+    manager = config_manager
+    config, version = manager.load_config_with_version("default.yaml")
+    assert config.metadata.name == "Test Dashboard"
+    assert version == manager.snapshot.versions["default.yaml"]
+    assert manager.load_config_with_version("missing.yaml") == (None, None)
+
+    # A delta never fails just because the history ring was dropped
+    manager.history.clear()
+    delta = manager.load_config_delta("unknown", "default.yaml")
+    assert delta["type"] == "full"
+    assert delta["version"] == version
+
+
+def test_derived_views_follow_the_snapshot(
+    config_manager, temp_config_dir, valid_config, write_config
+):
+    manager = config_manager
+    facets = manager.get_facets("default.yaml")
+    assert manager.snapshot.facets["default.yaml"] is facets
+    assert facets.facet_counts()["status"] == {"active": 1}
+
+    # A new version gets a new index; the published one is left alone
+    valid_config["categories"][0]["links"][0]["status"] = "down"
+    write_config(valid_config)
+    manager.reload(["default.yaml"])
+    assert facets.facet_counts()["status"] == {"active": 1}
+    assert manager.get_facets("default.yaml").facet_counts()["status"] == {"down": 1}
+
+    manager.get_palette_index("default.yaml")
+    (temp_config_dir / "default.yaml").unlink()
+    manager.reload()
+    assert "default.yaml" not in manager.history
+    assert "default.yaml" not in manager.palette_indexes
+    assert manager.get_facets("default.yaml") is None
+
+
+def test_edits_never_parse_yaml_on_the_request_thread(
+    config_manager, valid_config, write_config, monkeypatch
+):
+    safe_load = yaml.safe_load
+
+    def reloader_only(*args, **kwargs):
+        assert threading.current_thread().name == "navspec-reloader"
+        return safe_load(*args, **kwargs)
+
+    monkeypatch.setattr(yaml, "safe_load", reloader_only)
+    manager = config_manager
+    manager.stop_file_watching()
+
+    op = {"op": "add_category", "category": {"name": "First"}}
+    manager.edit_config("default.yaml", op)
+
+    # An outside edit is read into the journal by the reloader
+    valid_config["metadata"]["name"] = "Edited by hand"
+    write_config(valid_config)
+    op = {"op": "add_category", "category": {"name": "Second"}}
+    manager.edit_config("default.yaml", op)
+
+    config = manager.load_config("default.yaml")
+    assert config.metadata.name == "Edited by hand"
+    assert [c.name for c in config.categories][-1] == "Second"
@@ -0,0 +1,61 @@
+"""
+Tests for the persisted terminal search index.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from navspec.search import INDEX_FILE, load_index
+
+
+def test_index_persisted_and_rebuilt_on_change(
+    temp_config_dir, make_config, write_config
+):
+    config = make_config(
+        [
+            ("Grafana", "https://grafana.prod.example", "", ["production"]),
+            ("Grafana Staging", "https://grafana.staging.example", "", ["staging"]),
+        ]
+    )
+    write_config(config.to_dict())
+
+    index = load_index(str(temp_config_dir))
+    assert (temp_config_dir / ".navspec" / INDEX_FILE).exists()
+
+    [(_, best)] = index.search("grafana prod", limit=1)
+    assert best[0] == "Grafana"
+    assert index.search("grfna")[0][1][0] == "Grafana"
+    assert index.search("kibana") == []
+
+    config = make_config([("Kibana", "https://kibana.example", "", [])])
+    write_config(config.to_dict())
+    assert index.search("kibana") == []
+    assert load_index(str(temp_config_dir)).search("kibana")[0][1][0] == "Kibana"
+
+
+def test_query_does_not_import_flask_or_yaml(
+    temp_config_dir, make_config, write_config
+):
+    config = make_config([("Grafana", "https://grafana.example", "", [])])
+    write_config(config.to_dict())
+    load_index(str(temp_config_dir))
+
+    script = (
+        "import sys\n"
+        "from navspec.cli import main\n"
+        "sys.argv = ['navspec', 'query', 'grafana', '--config', sys.argv[1]]\n"
+        "main()\n"
+        "assert 'yaml' not in sys.modules and 'flask' not in sys.modules\n"
+    )
+    root = str(Path(__file__).resolve().parent.parent)
+    env = dict(os.environ, PYTHONPATH=root)
+    result = subprocess.run(
+        [sys.executable, "-c", script, str(temp_config_dir)],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "https://grafana.example" in result.stdout
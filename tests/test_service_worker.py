@@ -0,0 +1,33 @@
+"""
+Tests for the offline service worker and HTTP caching of API responses.
+"""
+
+from navspec.server import DashboardServer
+
+
+def test_config_endpoint_honours_etag(temp_config_dir):
+    server = DashboardServer(str(temp_config_dir))
+    server.config_manager.get_available_configs()
+    try:
+        client = server.app.test_client()
+        response = client.get("/api/config")
+        assert response.status_code == 200
+
+        etag = response.headers["ETag"]
+        assert etag.strip('"') == response.headers["X-Navspec-Version"]
+
+        response = client.get("/api/config", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+    finally:
+        server.stop()
+
+
+def test_service_worker_served_from_root(temp_config_dir):
+    server = DashboardServer(str(temp_config_dir))
+    try:
+        response = server.app.test_client().get("/sw.js")
+        assert response.status_code == 200
+        assert response.headers["Service-Worker-Allowed"] == "/"
+        assert response.headers["Cache-Control"] == "no-cache"
+    finally:
+        server.stop()
@@ -0,0 +1,243 @@
+"""
+Tests for remote config sources, using a local stand-in HTTP server.
+"""
+
+import io
+import tarfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import yaml
+
+from navspec.config import ConfigManager
+from navspec.sources import (
+    HTTPSource,
+    SourceError,
+    SourceScheduler,
+    TarballSource,
+    create_source,
+)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves the server's ``files`` dict and honours If-None-Match."""
+
+    def do_GET(self):
+        self.server.requests.append(self.headers.get("If-None-Match"))
+        body = self.server.files.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        etag = f'"{hash(body)}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.files = {}
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_http_source_conditional_fetch(temp_config_dir, stand_in_server, valid_config):
+    stand_in_server.files["/team.yaml"] = yaml.dump(valid_config).encode()
+
+    source = HTTPSource(_url(stand_in_server, "/team.yaml"))
+    source.attach(temp_config_dir / "sources", temp_config_dir / "remote")
+
+    assert source.refresh() is True
+    assert source.refresh() is False
+    assert stand_in_server.requests[0] is None
+    assert stand_in_server.requests[1] is not None
+
+    # An invalid update keeps the last good copy
+    stand_in_server.files["/team.yaml"] = b"metadata: [broken"
+    assert source.refresh() is False
+    data = yaml.safe_load((temp_config_dir / "remote" / "team.yaml").read_text())
+    assert data["metadata"]["name"] == valid_config["metadata"]["name"]
+
+
+def test_tarball_source_prunes_removed_files(temp_config_dir, valid_config):
+    def build(names):
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+            for name in names:
+                content = yaml.dump(valid_config).encode()
+                info = tarfile.TarInfo(f"dashboards/config/{name}")
+                info.size = len(content)
+                archive.addfile(info, io.BytesIO(content))
+        return buffer.getvalue()
+
+    tarball = temp_config_dir / "configs.tar.gz"
+    tarball.write_bytes(build(["a.yaml", "b.yaml"]))
+
+    source = TarballSource(str(tarball))
+    source.attach(temp_config_dir / "sources", temp_config_dir / "remote")
+    assert source.refresh() is True
+    assert sorted(p.name for p in (temp_config_dir / "remote").glob("*.yaml")) == [
+        "a.yaml",
+        "b.yaml",
+    ]
+
+    tarball.write_bytes(build(["a.yaml"]))
+    source._save_meta(dict(source._load_meta(), mtime=None))
+    assert source.refresh() is True
+    assert not (temp_config_dir / "remote" / "b.yaml").exists()
+
+
+def test_prune_keeps_files_owned_by_other_sources(temp_config_dir, valid_config):
+    def build(path, names):
+        with tarfile.open(path, mode="w:gz") as archive:
+            for name in names:
+                content = yaml.dump(valid_config).encode()
+                info = tarfile.TarInfo(name)
+                info.size = len(content)
+                archive.addfile(info, io.BytesIO(content))
+
+    first = temp_config_dir / "first.tar.gz"
+    second = temp_config_dir / "second.tar.gz"
+    build(first, ["shared.yaml"])
+    build(second, ["shared.yaml"])
+
+    sources = [TarballSource(str(first)), TarballSource(str(second))]
+    for source in sources:
+        source.attach(temp_config_dir / "sources", temp_config_dir / "remote")
+        source.refresh()
+
+    # The first source drops the file, but the second still provides it
+    build(first, [])
+    sources[0]._save_meta(dict(sources[0]._load_meta(), mtime=None))
+    sources[0].refresh()
+    assert (temp_config_dir / "remote" / "shared.yaml").exists()
+
+
+def test_scheduler_backs_off_on_failure(temp_config_dir, stand_in_server):
+    source = HTTPSource(_url(stand_in_server, "/missing.yaml"))
+    source.attach(temp_config_dir / "sources", temp_config_dir / "remote")
+
+    scheduler = SourceScheduler([source], interval=10)
+    first = scheduler.refresh(source)
+    second = scheduler.refresh(source)
+    assert 18 <= first <= 22
+    assert 36 <= second <= 44
+
+
+def test_scheduler_survives_unexpected_errors(temp_config_dir):
+    source = TarballSource(str(temp_config_dir / "missing.tar.gz"))
+    source.attach(temp_config_dir / "sources", temp_config_dir / "remote")
+    source.refresh = lambda: open(temp_config_dir)  # IsADirectoryError
+
+    scheduler = SourceScheduler([source], interval=10)
+    assert 18 <= scheduler.refresh(source) <= 22
+
+
+def test_unattached_source_raises_source_error():
+    with pytest.raises(SourceError):
+        HTTPSource("http://example.com/team.yaml").refresh()
+
+
+def test_http_source_requires_yaml_file():
+    with pytest.raises(ValueError):
+        create_source("http://example.com/")
+
+
+def test_manager_serves_remote_config(temp_config_dir, stand_in_server, valid_config):
+    stand_in_server.files["/team.yaml"] = yaml.dump(valid_config).encode()
+
+    manager = ConfigManager(
+        str(temp_config_dir), sources=[_url(stand_in_server, "/team.yaml")]
+    )
+    try:
+        # The scheduler fetches every source as soon as it starts
+        deadline = time.monotonic() + 5
+        while not (manager.remote_config_path / "team.yaml").exists():
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        assert manager.get_available_configs() == ["team.yaml"]
+        assert manager.load_config("team.yaml").metadata.name == "Test Dashboard"
+    finally:
+        manager.stop_file_watching()
+        manager.stop_remote_refresh()
+        manager.stop_reloading()
+
+
+def test_no_local_default_while_sources_pending(
+    temp_config_dir, stand_in_server, valid_config, monkeypatch
+):
+    stand_in_server.files["/default.yaml"] = yaml.dump(valid_config).encode()
+    release = threading.Event()
+    fetch = StandInHandler.do_GET
+
+    def slow_fetch(handler):
+        release.wait(5)
+        fetch(handler)
+
+    monkeypatch.setattr(StandInHandler, "do_GET", slow_fetch)
+
+    manager = ConfigManager(
+        str(temp_config_dir), sources=[_url(stand_in_server, "/default.yaml")]
+    )
+    try:
+        assert manager.get_available_configs() == []
+        assert not (manager.config_path / "default.yaml").exists()
+
+        release.set()
+        deadline = time.monotonic() + 5
+        while not manager.get_available_configs():
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        assert not (manager.config_path / "default.yaml").exists()
+    finally:
+        release.set()
+        manager.stop_file_watching()
+        manager.stop_remote_refresh()
+        manager.stop_reloading()
+
+
+def test_reloader_parent_fetches_no_sources(
+    temp_config_dir, stand_in_server, monkeypatch
+):
+    from navspec import cli
+    from navspec import server as server_module
+
+    calls = []
+    monkeypatch.delenv("WERKZEUG_RUN_MAIN", raising=False)
+    monkeypatch.setattr(
+        server_module, "run_simple", lambda *args, **kwargs: calls.append(kwargs)
+    )
+    argv = ["navspec", "serve", "--no-browser", "-c", str(temp_config_dir)]
+    argv += ["--source", _url(stand_in_server, "/team.yaml")]
+    monkeypatch.setattr("sys.argv", argv)
+
+    cli.main()
+
+    # Only the serving child runs the source scheduler
+    assert calls == [{"use_reloader": True}]
+    time.sleep(0.1)
+    assert stand_in_server.requests == []
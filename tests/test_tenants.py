@@ -0,0 +1,164 @@
+"""
+Tests for multi-tenant serving.
+"""
+
+import gc
+import threading
+import time
+import tracemalloc
+
+import pytest
+
+from navspec.server import DashboardServer
+from navspec.tenants import TenantRegistry
+
+
+@pytest.fixture
+def tenants_dir(temp_config_dir, valid_config, write_config):
+    for team in ("team-a", "team-b"):
+        (temp_config_dir / team).mkdir()
+        valid_config["metadata"]["name"] = team
+        write_config(valid_config, directory=temp_config_dir / team)
+    return temp_config_dir
+
+
+def test_path_routing_loads_tenants_lazily(tenants_dir):
+    server = DashboardServer(tenants_dir=str(tenants_dir))
+    try:
+        client = server.app.test_client()
+        assert server.tenants.stats()["loaded"] == 0
+
+        for team in ("team-a", "team-b"):
+            response = client.get(f"/{team}/api/config")
+            assert response.status_code == 200
+            assert response.json["metadata"]["name"] == team
+
+        assert b'data-root="/team-a"' in client.get("/team-a/").data
+        assert client.get("/missing/api/config").status_code == 404
+        assert client.get("/health").status_code == 200
+
+        stats = client.get("/_tenants").json
+        assert stats["misses"] == 2
+        assert stats["hits"] == 1
+        assert stats["tenants"]["team-a"]["memory"] > 0
+    finally:
+        server.stop()
+
+
+def test_host_routing(tenants_dir):
+    server = DashboardServer(tenants_dir=str(tenants_dir), tenant_routing="host")
+    try:
+        client = server.app.test_client()
+        response = client.get("/api/config", headers={"Host": "team-b.example.com"})
+        assert response.json["metadata"]["name"] == "team-b"
+    finally:
+        server.stop()
+
+
+def test_memory_budget_evicts_least_recently_used(tenants_dir):
+    server = DashboardServer(tenants_dir=str(tenants_dir), memory_budget=1)
+    try:
+        client = server.app.test_client()
+        client.get("/team-a/api/config")
+        client.get("/team-b/api/config")
+
+        tenants = server.tenants.tenants
+        assert not tenants["team-a"].loaded
+        assert tenants["team-a"].evictions == 1
+        assert tenants["team-b"].loaded
+
+        client.get("/team-a/api/config")
+        assert tenants["team-a"].loads == 2
+    finally:
+        server.stop()
+
+
+def test_idle_watchers_are_stopped(tenants_dir):
+    server = DashboardServer(tenants_dir=str(tenants_dir), idle_timeout=60)
+    try:
+        client = server.app.test_client()
+        client.get("/team-a/api/config")
+        tenant = server.tenants.tenants["team-a"]
+        assert tenant.watching
+
+        assert server.tenants.stop_idle_watchers(time.monotonic() + 120) == 1
+        assert not tenant.watching and tenant.loaded
+
+        client.get("/team-a/api/config")
+        assert tenant.watching
+    finally:
+        server.stop()
+
+
+def test_slow_load_does_not_block_other_tenants(tenants_dir, monkeypatch):
+    from navspec import tenants as tenants_module
+    from navspec.tenants import TenantRegistry
+
+    started = threading.Event()
+    proceed = threading.Event()
+    real_manager = tenants_module.ConfigManager
+
+    def slow_manager(path):
+        if path.endswith("team-a"):
+            started.set()
+            assert proceed.wait(5)
+        return real_manager(path)
+
+    monkeypatch.setattr(tenants_module, "ConfigManager", slow_manager)
+    registry = TenantRegistry(str(tenants_dir))
+    try:
+        loading = threading.Thread(
+            target=lambda: registry.release(registry.acquire("team-a"))
+        )
+        loading.start()
+        assert started.wait(5)
+
+        # team-b loads, and stats answer, while team-a is still being built
+        registry.release(registry.acquire("team-b"))
+        assert registry.stats()["tenants"]["team-b"]["loaded"]
+        assert not registry.tenants["team-a"].loaded
+
+        proceed.set()
+        loading.join(5)
+        assert registry.tenants["team-a"].loaded
+    finally:
+        proceed.set()
+        registry.close()
+
+
+def test_memory_estimate_tracks_real_allocation(
+    temp_config_dir, valid_config, write_config
+):
+    link = valid_config["categories"][0]["links"][0]
+    valid_config["categories"] = [
+        {
+            "name": f"Category {c}",
+            "description": "",
+            "links": [
+                dict(link, name=f"link {c}-{i}", url=f"https://{c}-{i}.example/")
+                for i in range(50)
+            ],
+        }
+        for c in range(10)
+    ]
+    (temp_config_dir / "team-a").mkdir()
+    write_config(valid_config, directory=temp_config_dir / "team-a")
+
+    registry = TenantRegistry(str(temp_config_dir))
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tenant = registry.acquire("team-a")
+        manager = tenant.config_manager
+        manager.reload()
+        manager.get_palette_index("default.yaml")
+        gc.collect()
+        allocated = tracemalloc.get_traced_memory()[0]
+        registry.release(tenant)
+        estimate = tenant.memory
+    finally:
+        tracemalloc.stop()
+        registry.close()
+
+    # Parsed configs, facets and indexes make up nearly all of a tenant
+    assert allocated / 2 < estimate < allocated * 2